@@ -1,26 +1,53 @@
 from fastapi import FastAPI
-from utils import scrape_news, analyze_sentiment, text_to_speech, comparative_analysis, generate_final_output
+from fastapi.responses import Response, StreamingResponse
+from utils import scrape_news, iter_news, text_to_speech, text_to_speech_audio, comparative_analysis, generate_final_output, warm_up, STARTUP_TIMINGS, sentiment_cache, audio_cache, reel_cache
+from backgrounds import background_cache
 import json
 import os
+import threading
 
 app = FastAPI()
 
+@app.on_event("startup")
+def start_warm_up():
+    # Load the model in the background so light endpoints answer immediately after boot
+    threading.Thread(target=warm_up, kwargs={"speech": True}, daemon=True).start()
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "startup_timings": STARTUP_TIMINGS, "sentiment_cache": sentiment_cache.stats(), "audio_cache": audio_cache.stats(), "reel_cache": reel_cache.stats(), "background_cache": background_cache.stats()}
+
 @app.get("/news/{company_name}")
-def get_news(company_name: str):
-    articles = scrape_news(company_name)
-    for article in articles:
-        article['sentiment'] = analyze_sentiment(article['summary'])
+def get_news(company_name: str, full_text: bool = False):
+    articles = scrape_news(company_name, fetch_bodies=full_text)
     
     comparative_analysis_result = comparative_analysis(articles)
     final_output = generate_final_output(company_name, articles, comparative_analysis_result)
     
     return final_output
 
+@app.get("/news/{company_name}/stream")
+def stream_news(company_name: str, limit: int = 30, full_text: bool = False):
+    """Stream articles as newline-delimited JSON while later pages are still being fetched."""
+    def generate():
+        for article in iter_news(company_name, limit=limit, fetch_bodies=full_text):
+            yield json.dumps(article) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.get("/tts/{text}")
 def get_tts(text: str):
     audio_file, _ = text_to_speech(text)
     return {"message": "TTS generated successfully", "audio_file": audio_file}
 
+@app.get("/tts/{text}/audio")
+def get_tts_audio(text: str, language: str = "hi"):
+    """Return the spoken audio itself, straight from memory or the audio cache."""
+    audio, mime_type, _ = text_to_speech_audio(text, language=language)
+    if not audio:
+        return Response(status_code=502)
+    return Response(content=audio, media_type=mime_type)
+
 @app.get("/notifications/")
 def get_notifications():
     NOTIFICATIONS_FILE = "notifications.json"
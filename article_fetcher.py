@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+import logging
+import threading
+
+from cache import DiskCache
+
+ARTICLE_FETCH_WORKERS = 8  # Article pages downloaded at once across all hosts
+ARTICLE_PER_HOST_LIMIT = 2  # Concurrent requests allowed to any single news site
+ARTICLE_TIMEOUT = 6  # Seconds allowed for each article request
+ARTICLE_DEADLINE = 15  # Seconds allowed for a whole fetch_article_bodies call
+MAX_BODY_CHARS = 6000  # Extracted bodies are cut to this length
+MIN_PARAGRAPH_CHARS = 40  # Shorter paragraphs are usually captions, bylines or buttons
+
+body_cache = DiskCache("article_bodies", ttl=24 * 3600, max_bytes=64 * 1024 * 1024)
+
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+
+def _host_semaphore(url):
+    host = urlparse(url).netloc.lower()
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(ARTICLE_PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+class _ParagraphCollector(HTMLParser):
+    """Collects paragraph text, remembering which paragraphs sit inside <article>."""
+
+    SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []  # (inside_article, text)
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag == "p" and not self.skip_depth:
+            self._flush()
+            self.current = []
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "article":
+            self._flush()
+            self.article_depth = max(0, self.article_depth - 1)
+        elif tag == "p":
+            self._flush()
+
+    def handle_data(self, data):
+        if self.current is not None and not self.skip_depth:
+            self.current.append(data)
+
+    def _flush(self):
+        if self.current is not None:
+            text = " ".join("".join(self.current).split())
+            if len(text) >= MIN_PARAGRAPH_CHARS:
+                self.paragraphs.append((self.article_depth > 0, text))
+            self.current = None
+
+
+def extract_main_text(html):
+    """Return the main body text of an article page, preferring paragraphs inside <article>."""
+    collector = _ParagraphCollector()
+    try:
+        collector.feed(html or "")
+        collector.close()
+    except Exception as e:
+        logging.warning(f"⚠️ Could not parse article HTML: {e}")
+    collector._flush()
+    in_article = [text for inside, text in collector.paragraphs if inside]
+    paragraphs = in_article or [text for _, text in collector.paragraphs]
+    body = "\n".join(paragraphs)
+    if len(body) > MAX_BODY_CHARS:
+        body = body[:MAX_BODY_CHARS].rsplit(" ", 1)[0]
+    return body
+
+
+def _fetch_one(session, url, timeout):
+    with _host_semaphore(url):
+        response = session.get(url, timeout=timeout)
+    content_type = response.headers.get("Content-Type", "")
+    if not response.ok or "html" not in content_type:
+        return ""
+    return extract_main_text(response.text)
+
+
+def fetch_article_bodies(urls, session, max_workers=ARTICLE_FETCH_WORKERS, timeout=ARTICLE_TIMEOUT, deadline=ARTICLE_DEADLINE):
+    """Download and extract article bodies concurrently, returning {url: body}.
+
+    Bodies come from the shared cache when possible. Pages that fail, time out or
+    are still pending when ``deadline`` passes are left out of the result.
+    """
+    urls = [u for u in dict.fromkeys(urls) if u.startswith(("http://", "https://"))]
+    bodies = body_cache.get_many(urls)
+    missing = [u for u in urls if u not in bodies]
+    if not missing:
+        return bodies
+
+    fetched = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing))))
+    futures = {pool.submit(_fetch_one, session, url, timeout): url for url in missing}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            url = futures[future]
+            try:
+                body = future.result()
+            except Exception as e:
+                logging.warning(f"⚠️ Article fetch failed for {url}: {e}")
+                continue
+            if body:
+                fetched[url] = body
+    except FuturesTimeout:
+        logging.warning(f"⚠️ Article fetch deadline hit, {len(missing) - len(fetched)} pages skipped")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    body_cache.set_many(fetched)
+    bodies.update(fetched)
+    logging.info(f"📄 Article bodies: {len(bodies)}/{len(urls)} available, {len(fetched)} fetched")
+    return bodies
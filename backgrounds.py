@@ -0,0 +1,134 @@
+"""Pre-rendered reel backgrounds.
+
+A color background (with its fade-in) only depends on the color, the frame
+size, the frame rate and the reel length. Color clips are encoded once per
+duration bucket and kept in a file cache, so rendering a reel only has to trim
+a stored clip and burn in subtitles and audio.
+
+Uploaded images are rarely reused, so encoding a clip for them would add a
+second encode to almost every reel. Only the image scaled and padded to the
+frame is cached, as a PNG, and the reel render loops that still.
+
+Pre-render the standard backgrounds with:
+    python backgrounds.py --colors black --profiles fast --max-seconds 60
+"""
+import argparse
+import hashlib
+import logging
+import math
+import os
+
+from cache import FileCache, file_digest
+
+BACKGROUND_BUCKET_SECONDS = 10  # Clips are rendered to the next multiple of this length and trimmed per reel
+BACKGROUND_CACHE_MAX_BYTES = int(os.environ.get("BACKGROUND_CACHE_MAX_BYTES", 500 * 1024 * 1024))
+BACKGROUND_PRESET = "veryfast"
+BACKGROUND_CRF = 18  # Near-transparent, since the clip is encoded again with the subtitles
+STANDARD_BACKGROUNDS = ["black"]
+
+background_cache = FileCache("backgrounds", max_bytes=BACKGROUND_CACHE_MAX_BYTES)
+
+
+def duration_bucket(seconds):
+    return max(1, math.ceil(seconds / BACKGROUND_BUCKET_SECONDS)) * BACKGROUND_BUCKET_SECONDS
+
+
+def background_key(bg_color, width, height, fps, seconds):
+    settings = f"color:{bg_color}\0{width}x{height}\0{fps}\0{seconds}\0{BACKGROUND_PRESET}\0{BACKGROUND_CRF}"
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+
+def still_key(image_path, width, height):
+    return hashlib.sha256(f"image:{file_digest(image_path)}\0{width}x{height}".encode("utf-8")).hexdigest()
+
+
+def render_background(output_file, bg_color="black", width=720, height=1280, fps=30, seconds=10):
+    import ffmpeg
+
+    video = ffmpeg.input(f"color={bg_color}:s={width}x{height}:r={fps}", f="lavfi", t=seconds).filter("fade", "in", st=0, d=1)
+    (
+        ffmpeg
+        .output(video, output_file, vcodec="libx264", preset=BACKGROUND_PRESET, crf=BACKGROUND_CRF,
+                pix_fmt="yuv420p", r=fps, an=None)
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return output_file
+
+
+def render_still(output_file, image_path, width=720, height=1280):
+    import ffmpeg
+
+    (
+        ffmpeg
+        .input(image_path)
+        .filter("scale", width, height, force_original_aspect_ratio="decrease")
+        .filter("pad", width, height, "(ow-iw)/2", "(oh-ih)/2")
+        .output(output_file, vframes=1, update=1)
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return output_file
+
+
+def _cached_render(key, suffix, render, description):
+    cached = background_cache.get(key, suffix)
+    if cached:
+        return cached
+    tmp_path = background_cache.temp_path(suffix)
+    try:
+        render(tmp_path)
+        logging.info(f"🎞️ Rendered {description}")
+        return background_cache.put_file(key, tmp_path, suffix)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def background_clip(bg_color="black", width=720, height=1280, fps=30, seconds=10):
+    """Path of a cached color background clip at least ``seconds`` long, rendering it on a miss."""
+    length = duration_bucket(seconds)
+    return _cached_render(
+        background_key(bg_color, width, height, fps, length), ".mp4",
+        lambda path: render_background(path, bg_color, width, height, fps, length),
+        f"{length}s {width}x{height} background clip",
+    )
+
+
+def background_still(image_path, width=720, height=1280):
+    """Path of a cached PNG of the image scaled and padded to the frame, rendering it on a miss."""
+    return _cached_render(
+        still_key(image_path, width, height), ".png",
+        lambda path: render_still(path, image_path, width, height),
+        f"{width}x{height} background still",
+    )
+
+
+def background_input(bg_color="black", image_path=None, width=720, height=1280, fps=30, seconds=10):
+    """ffmpeg input for a reel background of exactly ``seconds``: a looped image still or a trimmed color clip."""
+    import ffmpeg
+
+    if image_path and os.path.exists(image_path):
+        return ffmpeg.input(background_still(image_path, width, height), loop=1, t=seconds, framerate=fps)
+    return ffmpeg.input(background_clip(bg_color, width, height, fps, seconds), t=seconds)
+
+
+def prerender_backgrounds(colors=STANDARD_BACKGROUNDS, profiles=None, max_seconds=60):
+    """Fill the cache with every duration bucket up to ``max_seconds`` for the given colors and profiles."""
+    from utils import RENDER_PROFILES, DEFAULT_RENDER_PROFILE
+
+    for profile in profiles or [DEFAULT_RENDER_PROFILE]:
+        settings = RENDER_PROFILES[profile]
+        for color in colors:
+            for seconds in range(BACKGROUND_BUCKET_SECONDS, duration_bucket(max_seconds) + 1, BACKGROUND_BUCKET_SECONDS):
+                background_clip(color, settings["width"], settings["height"], settings["fps"], seconds)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--colors", nargs="+", default=STANDARD_BACKGROUNDS)
+    parser.add_argument("--profiles", nargs="+", help="render profiles to prepare (default: REEL_PROFILE)")
+    parser.add_argument("--max-seconds", type=float, default=60, help="longest reel to prepare backgrounds for")
+    args = parser.parse_args()
+    prerender_backgrounds(args.colors, args.profiles, args.max_seconds)
@@ -0,0 +1,108 @@
+"""Check and time near-duplicate detection on labelled article pairs.
+
+Each pair is either two copies of one story (syndicated or lightly edited) or
+two different stories that share most of their wording. Prints the estimated
+similarity of every pair, whether NearDuplicateIndex merged it, and lookup
+throughput; exits with status 1 if any pair is merged or kept apart wrongly.
+
+Usage:
+    python benchmarks/bench_dedup.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_parser import NO_SUMMARY  # noqa: E402
+from text_analysis import NearDuplicateIndex, article_signature, estimated_similarity  # noqa: E402
+
+# (first article, second article, same story?)
+PAIRS = [
+    (
+        {"title": "Tesla shares fall after earnings miss", "summary": NO_SUMMARY},
+        {"title": "Tesla shares rise after earnings beat", "summary": NO_SUMMARY},
+        False,
+    ),
+    (
+        {"title": "Google announces new AI model for search", "summary": NO_SUMMARY},
+        {"title": "Google announces new AI chip for cloud", "summary": NO_SUMMARY},
+        False,
+    ),
+    (
+        {"title": "Tesla shares fall after earnings miss",
+         "summary": "Tesla stock dropped 8% on Thursday after the carmaker reported quarterly profit below analyst forecasts."},
+        {"title": "Tesla shares rise after earnings beat",
+         "summary": "Tesla stock jumped 8% on Thursday after the carmaker reported quarterly profit above analyst forecasts."},
+        False,
+    ),
+    (
+        {"title": "Google announces new AI model for search",
+         "summary": "The company said the model will power answers in Google Search for users in the US starting next week."},
+        {"title": "Google announces new AI chip for cloud",
+         "summary": "The company said the chip will power training in Google Cloud for customers in the US starting next year."},
+        False,
+    ),
+    (
+        {"title": "Apple recalls chargers over overheating risk", "summary": NO_SUMMARY},
+        {"title": "Apple recalls chargers over overheating risk", "summary": NO_SUMMARY},
+        True,
+    ),
+    (
+        {"title": "Microsoft to acquire gaming studio for $2 billion",
+         "summary": "Microsoft agreed to buy the independent gaming studio for $2 billion in cash, the company said on Monday, "
+                    "adding the deal is expected to close by the end of the year pending regulatory approval."},
+        {"title": "Microsoft to acquire gaming studio for $2 billion - Reuters",
+         "summary": "Microsoft agreed to buy the independent gaming studio for $2 billion in cash, the company said Monday, "
+                    "adding the deal is expected to close by the end of the year pending regulatory approval."},
+        True,
+    ),
+    (
+        {"title": "Amazon opens first drone delivery hub in Europe",
+         "summary": "Amazon opened its first European drone delivery hub in Italy, promising parcels within an hour "
+                    "for customers living near the site."},
+        {"title": "Amazon opens first drone delivery hub in Europe | TechNews",
+         "summary": "Amazon has opened its first European drone delivery hub in Italy, promising parcels within an hour "
+                    "for customers living near the site."},
+        True,
+    ),
+]
+
+
+def merged(first, second):
+    index = NearDuplicateIndex()
+    signature, threshold = article_signature(first)
+    index.add(signature, first, threshold)
+    signature, threshold = article_signature(second)
+    return index.find(signature, threshold) is first
+
+
+def main(repeat):
+    failures = 0
+    print(f"{'similarity':>10} {'expected':>9} {'merged':>7}  pair")
+    for first, second, same_story in PAIRS:
+        similarity = estimated_similarity(article_signature(first)[0], article_signature(second)[0])
+        was_merged = merged(first, second)
+        ok = was_merged == same_story
+        failures += not ok
+        print(f"{similarity:>10.2f} {str(same_story):>9} {str(was_merged):>7}  {first['title']} / {second['title']}{'' if ok else '  <-- WRONG'}")
+
+    articles = [article for pair in PAIRS for article in pair[:2]]
+    index = NearDuplicateIndex()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for article in articles:
+            signature, threshold = article_signature(article)
+            if index.find(signature, threshold) is None:
+                index.add(signature, article, threshold)
+    elapsed = time.perf_counter() - started
+    print(f"\n{repeat * len(articles) / elapsed:.0f} articles/s signed and looked up")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    sys.exit(1 if main(args.repeat) else 0)
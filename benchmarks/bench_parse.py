@@ -0,0 +1,71 @@
+"""Compare news-card parser backends over Bing results pages in fixtures/.
+
+The bundled fixture is synthetic (filler cards in Bing's markup); save real
+pages with --save to benchmark against live markup.
+
+Usage:
+    python benchmarks/bench_parse.py                 # benchmark every fixture
+    python benchmarks/bench_parse.py --save Tesla    # save a live results page as a new fixture
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_parser import PARSER_BACKENDS  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def save_fixture(term):
+    import requests
+    from utils import HTTP_HEADERS
+
+    query = "+".join(term.lower().split())
+    response = requests.get(f"https://www.bing.com/news/search?q={query}&FORM=HDRSC6", headers=HTTP_HEADERS, timeout=10)
+    path = os.path.join(FIXTURES_DIR, f"bing_{query.replace('+', '_')}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(response.text)
+    print(f"Saved {len(response.text)} bytes to {path}")
+
+
+def run(backends, repeat):
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+    print(f"{'fixture':<32} {'backend':<8} {'cards':>5} {'ms/page':>9} {'same as bs4':>12}")
+    for path in fixtures:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        reference = None
+        for name in backends:
+            parse = PARSER_BACKENDS[name]
+            try:
+                cards = parse(html)
+            except ImportError as e:
+                print(f"{os.path.basename(path):<32} {name:<8} skipped ({e})")
+                continue
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse(html)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+            if name == "bs4":
+                reference = cards
+            same = "-" if reference is None else str(cards == reference)
+            print(f"{os.path.basename(path):<32} {name:<8} {len(cards):>5} {elapsed_ms:>9.2f} {same:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save", metavar="TERM", help="fetch and store the Bing results page for TERM")
+    parser.add_argument("--repeat", type=int, default=20, help="parses per backend and fixture")
+    parser.add_argument("--backends", nargs="+", default=["bs4", "lxml", "stream"], choices=sorted(PARSER_BACKENDS))
+    args = parser.parse_args()
+    if args.save:
+        save_fixture(args.save)
+    else:
+        run(args.backends, args.repeat)
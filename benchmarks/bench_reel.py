@@ -0,0 +1,103 @@
+"""Compare reel render profiles on speed and output size.
+
+Renders fixed sample texts on a color background with every profile in
+utils.RENDER_PROFILES. Narration is a silent WAV of the length the text would
+take to speak, so the run needs no network and measures encoding only.
+Reports seconds per reel, how many seconds of video are encoded per wall
+second, reels per minute with several renders in flight, and average file size.
+Background clips come from the background cache, so clear `.cache/backgrounds`
+to include their one-off render in the sequential timings.
+
+Usage:
+    python benchmarks/bench_reel.py [--profiles draft fast quality] [--parallel 2] [--font /path/to/font.ttf --font-name "Font Family"]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLES = [
+    "Shares rose sharply after the company reported better than expected quarterly earnings, "
+    "lifted by strong demand for its cloud services.",
+    "Regulators opened an investigation into how the firm handled customer data after a breach "
+    "exposed millions of accounts. The company said it is cooperating fully and has hired an outside "
+    "security firm to review its systems.",
+    "A partnership with a leading chipmaker will bring faster AI features to laptops next year. "
+    "Analysts expect the deal to strengthen both companies in a crowded market, although some warn "
+    "that supply shortages could delay the launch. The first devices are due in the spring, with "
+    "wider availability planned for the holiday season.",
+]
+
+
+def silent_wav(path, seconds, rate=16000):
+    with wave.open(path, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(b"\0\0" * int(seconds * rate))
+
+
+def render(job):
+    from utils import render_reel
+
+    text, audio_path, output, profile, font_path, font_name = job
+    started = time.perf_counter()
+    render_reel(text, audio_path, output, profile=profile, font_path=font_path, font_name=font_name)
+    return time.perf_counter() - started, os.path.getsize(output)
+
+
+def main(profiles, parallel, repeat, font_path, font_name):
+    from text_analysis import CHARS_PER_SECOND
+
+    with tempfile.TemporaryDirectory() as directory:
+        narrations = []
+        for index, text in enumerate(SAMPLES):
+            audio_path = os.path.join(directory, f"narration_{index}.wav")
+            seconds = max(len(text) / CHARS_PER_SECOND, 2)
+            silent_wav(audio_path, seconds)
+            narrations.append((text, audio_path, seconds))
+        video_seconds = sum(seconds for _, _, seconds in narrations) * repeat
+
+        print(f"{'profile':<8} {'s/reel':>7} {'video s/s':>10} {'reels/min':>10} {'avg KB':>8}")
+        for profile in profiles:
+            jobs = [
+                (text, audio_path, os.path.join(directory, f"{profile}_{round_}_{index}.mp4"), profile, font_path, font_name)
+                for round_ in range(repeat)
+                for index, (text, audio_path, _) in enumerate(narrations)
+            ]
+            try:
+                # Sequential pass: latency of one reel on an otherwise idle machine
+                timings = [render(job) for job in jobs]
+                # Parallel pass: throughput when several sessions render at once
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=parallel) as pool:
+                    list(pool.map(render, jobs))
+                wall = time.perf_counter() - started
+            except Exception as e:
+                print(f"{profile:<8} failed: {e}")
+                continue
+            seconds = [elapsed for elapsed, _ in timings]
+            print(
+                f"{profile:<8} {statistics.mean(seconds):>7.2f} {video_seconds / sum(seconds):>10.1f} "
+                f"{len(jobs) / wall * 60:>10.1f} {statistics.mean(size for _, size in timings) / 1024:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    from utils import RENDER_PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=list(RENDER_PROFILES), choices=list(RENDER_PROFILES))
+    parser.add_argument("--parallel", type=int, default=2, help="renders in flight for the throughput pass")
+    parser.add_argument("--repeat", type=int, default=1, help="times the sample set is rendered per pass")
+    parser.add_argument("--font", help="font file to use instead of the platform default")
+    parser.add_argument("--font-name", help="family name of --font, as subtitle styles refer to it")
+    args = parser.parse_args()
+    main(args.profiles, args.parallel, args.repeat, args.font, args.font_name)
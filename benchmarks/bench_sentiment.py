@@ -0,0 +1,112 @@
+"""Compare the PyTorch and quantized ONNX sentiment backends.
+
+Each backend runs in its own subprocess so peak memory is measured in
+isolation. Reports accuracy on a small labelled headline set, agreement with
+the PyTorch pipeline, throughput and peak RSS.
+
+Usage:
+    python benchmarks/bench_sentiment.py [--repeat 20] [--batch-size 16]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLES = [
+    ("Shares surge after the company beats quarterly earnings expectations", "POSITIVE"),
+    ("Regulators fine the firm over repeated privacy violations", "NEGATIVE"),
+    ("New phone receives glowing reviews for battery life and camera", "POSITIVE"),
+    ("Thousands of employees laid off as sales slump", "NEGATIVE"),
+    ("Partnership with chipmaker expected to boost AI capabilities", "POSITIVE"),
+    ("Security flaw exposes millions of user accounts", "NEGATIVE"),
+    ("Startup wins award for innovative clean energy software", "POSITIVE"),
+    ("Investors flee as the stock hits a five-year low", "NEGATIVE"),
+    ("Customers praise the smooth rollout of the latest update", "POSITIVE"),
+    ("Outage leaves businesses without service for hours", "NEGATIVE"),
+    ("Record profits allow the company to raise its dividend", "POSITIVE"),
+    ("Lawsuit alleges the app secretly tracked children", "NEGATIVE"),
+    ("Analysts upgrade the outlook citing strong cloud growth", "POSITIVE"),
+    ("Recall ordered after devices were found to overheat", "NEGATIVE"),
+    ("The merger creates a powerful new leader in the market", "POSITIVE"),
+    ("CEO resigns amid accounting scandal", "NEGATIVE"),
+    ("Hospital adopts AI tool that speeds up accurate diagnoses", "POSITIVE"),
+    ("Supply shortages delay the launch by several months", "NEGATIVE"),
+    ("Fans celebrate a thrilling championship victory", "POSITIVE"),
+    ("Factory fire halts production and injures workers", "NEGATIVE"),
+    ("The redesigned car is faster, cheaper and more efficient", "POSITIVE"),
+    ("Hackers steal sensitive data in a massive breach", "NEGATIVE"),
+    ("Volunteers help the town recover quickly after the storm", "POSITIVE"),
+    ("Critics slam the disappointing and buggy release", "NEGATIVE"),
+]
+
+
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def worker(backend, repeat, batch_size):
+    from utils import build_sentiment_pipeline
+
+    started = time.perf_counter()
+    pipe = build_sentiment_pipeline(backend)
+    load_seconds = time.perf_counter() - started
+    if backend == "onnx" and type(pipe).__name__ != "OnnxSentimentPipeline":
+        sys.exit("ONNX backend failed to load; see the log above")
+
+    texts = [text for text, _ in SAMPLES]
+    predictions = [r["label"] for r in pipe(texts, batch_size=batch_size, truncation=True)]
+    workload = texts * repeat
+    started = time.perf_counter()
+    for start in range(0, len(workload), batch_size):
+        pipe(workload[start:start + batch_size], batch_size=batch_size, truncation=True)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "backend": backend,
+        "predictions": predictions,
+        "load_seconds": load_seconds,
+        "texts_per_second": len(workload) / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+
+def main(repeat, batch_size, backends):
+    reports = {}
+    for backend in backends:
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker", backend, "--repeat", str(repeat), "--batch-size", str(batch_size)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        reports[backend] = json.loads(output.strip().splitlines()[-1])
+
+    labels = [label for _, label in SAMPLES]
+    reference = reports.get("pytorch", {}).get("predictions")
+    print(f"{'backend':<8} {'accuracy':>9} {'agreement':>10} {'texts/s':>9} {'load s':>7} {'peak MB':>8}")
+    for backend, report in reports.items():
+        predictions = report["predictions"]
+        accuracy = sum(p == l for p, l in zip(predictions, labels)) / len(labels)
+        agreement = "-" if reference is None else f"{sum(p == r for p, r in zip(predictions, reference)) / len(reference):.1%}"
+        print(
+            f"{backend:<8} {accuracy:>9.1%} {agreement:>10} {report['texts_per_second']:>9.1f} "
+            f"{report['load_seconds']:>7.1f} {report['peak_rss_mb']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="times the sample set is classified for throughput")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "onnx"], choices=["pytorch", "onnx"])
+    parser.add_argument("--worker", choices=["pytorch", "onnx"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args.worker, args.repeat, args.batch_size)
+    else:
+        main(args.repeat, args.batch_size, args.backends)
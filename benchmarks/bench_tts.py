@@ -0,0 +1,86 @@
+"""Compare text-to-speech engines on latency and throughput.
+
+Every installed engine that supports the language speaks the same sentences
+directly (the audio cache is bypassed). Reports median and p95 latency of
+sequential calls, then characters per second with several calls in flight.
+
+Usage:
+    python benchmarks/bench_tts.py [--language en] [--repeat 3] [--concurrency 4]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLES = [
+    "Shares rose sharply after the company reported better than expected quarterly earnings.",
+    "Regulators opened an investigation into how the firm handled customer data.",
+    "The new phone goes on sale next week in twelve countries.",
+    "Analysts expect cloud revenue to keep growing through the rest of the year.",
+    "A partnership with a leading chipmaker will bring faster AI features to laptops.",
+    "Thousands of employees were told their roles would be cut as sales slowed.",
+]
+
+
+def speak(engine, text, language):
+    started = time.perf_counter()
+    audio = engine.synthesize(text, language)
+    return time.perf_counter() - started, len(audio)
+
+
+def bench_engine(engine, language, repeat, concurrency):
+    latencies, sizes = [], []
+    for _ in range(repeat):
+        for text in SAMPLES:
+            elapsed, size = speak(engine, text, language)
+            latencies.append(elapsed)
+            sizes.append(size)
+    workload = SAMPLES * repeat
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda text: speak(engine, text, language), workload))
+    elapsed = time.perf_counter() - started
+    return {
+        "p50": statistics.median(latencies),
+        "p95": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+        "chars_per_second": sum(len(text) for text in workload) / elapsed,
+        "kb_per_clip": statistics.mean(sizes) / 1024,
+    }
+
+
+def main(language, repeat, concurrency, names):
+    from tts_engines import ENGINES
+
+    print(f"{'engine':<8} {'p50 s':>7} {'p95 s':>7} {'chars/s':>9} {'KB/clip':>8}")
+    for name in names:
+        engine = ENGINES[name]
+        if not engine.available():
+            print(f"{name:<8} not installed")
+            continue
+        if not engine.supports(language):
+            print(f"{name:<8} does not support '{language}'")
+            continue
+        try:
+            report = bench_engine(engine, language, repeat, concurrency)
+        except Exception as e:
+            print(f"{name:<8} failed: {e}")
+            continue
+        print(
+            f"{name:<8} {report['p50']:>7.2f} {report['p95']:>7.2f} "
+            f"{report['chars_per_second']:>9.0f} {report['kb_per_clip']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--repeat", type=int, default=3, help="times the sample set is spoken sequentially")
+    parser.add_argument("--concurrency", type=int, default=4, help="calls in flight for the throughput run")
+    parser.add_argument("--engines", nargs="+", default=["gtts", "espeak", "pyttsx3"], choices=["gtts", "espeak", "pyttsx3"])
+    args = parser.parse_args()
+    main(args.language, args.repeat, args.concurrency, args.engines)
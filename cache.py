@@ -0,0 +1,264 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("NEWS_CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """SQLite-backed key/value cache with a TTL and size-bounded LRU eviction.
+
+    Values must be JSON serialisable. The database file can be shared by the
+    API, the scheduler and Streamlit sessions; each process keeps its own
+    hit/miss counters.
+    """
+
+    def __init__(self, name, ttl=None, max_entries=1000, max_bytes=None, cache_dir=CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None):
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self._count(False)
+                return default
+            with conn:
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._count(True)
+            return json.loads(row[0])
+        except Exception as e:
+            logging.error(f"❌ Cache read failed ({self.path}): {e}")
+            self._count(False)
+            return default
+
+    def get_many(self, keys):
+        """Return a {key: value} dict for every key that is present and fresh."""
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        try:
+            conn = self._connect()
+            now = time.time()
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value, created FROM entries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, value, created in rows:
+                    if self.ttl is None or now - created <= self.ttl:
+                        found[key] = json.loads(value)
+            if found:
+                with conn:
+                    conn.executemany("UPDATE entries SET accessed = ? WHERE key = ?", [(now, k) for k in found])
+        except Exception as e:
+            logging.error(f"❌ Cache read failed ({self.path}): {e}")
+        with self._stats_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        if not items:
+            return
+        try:
+            conn = self._connect()
+            now = time.time()
+            rows = []
+            for key, value in items.items():
+                encoded = json.dumps(value)
+                rows.append((key, encoded, len(encoded), now, now))
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+                self._evict(conn)
+        except Exception as e:
+            logging.error(f"❌ Cache write failed ({self.path}): {e}")
+
+    def _evict(self, conn):
+        if self.ttl is not None:
+            conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC").fetchall():
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def stats(self):
+        conn = self._connect()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class FileCache:
+    """Directory of content-addressed files with a disk quota and LRU eviction.
+
+    Entries are plain files named after their key, so callers can hand the path
+    straight to ffmpeg, Streamlit or FastAPI. Reading an entry refreshes its
+    modification time, which is what eviction orders by.
+    """
+
+    def __init__(self, name, max_bytes, cache_dir=CACHE_DIR):
+        self.directory = os.path.join(cache_dir, name)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, key, suffix=""):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def get(self, key, suffix=""):
+        """Return the cached file path for ``key``, or None."""
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def get_any(self, candidates):
+        """Return the path of the first cached (key, suffix) candidate, counting one lookup."""
+        for key, suffix in candidates:
+            path = self.path_for(key, suffix)
+            try:
+                os.utime(path)
+            except OSError:
+                continue
+            with self._lock:
+                self.hits += 1
+            return path
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def temp_path(self, suffix=""):
+        """A unique scratch path inside the cache directory, for writers that need a filename."""
+        return os.path.join(self.directory, f".tmp-{os.getpid()}-{threading.get_ident()}-{time.time_ns()}{suffix}")
+
+    def put_file(self, key, source_path, suffix=""):
+        """Move a finished file into the cache atomically and return its cached path."""
+        path = self.path_for(key, suffix)
+        os.replace(source_path, path)
+        self.evict(keep=path)
+        return path
+
+    def put_bytes(self, key, data, suffix=""):
+        tmp = self.temp_path(suffix)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        return self.put_file(key, tmp, suffix)
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(".tmp-"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self, keep=None):
+        """Delete least recently used files until the cache fits its quota, sparing ``keep``."""
+        try:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        except Exception as e:
+            logging.error(f"❌ Cache eviction failed ({self.directory}): {e}")
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,199 @@
+"""Shared sentiment inference service.
+
+One process holds the model and serves every Streamlit session, uvicorn
+worker and the scheduler. Requests from all clients go into one queue and
+run as dynamic micro-batches: a batch closes when it reaches ``max_batch``
+texts or when its oldest text has waited ``max_wait_ms``.
+
+Run it with:
+    python inference_server.py --address 127.0.0.1:8765
+    python inference_server.py --address unix:/tmp/news-sentiment.sock
+
+The wire protocol is newline-delimited JSON: clients send
+``{"texts": [...]}`` and receive ``{"labels": [...], "model": ..., "backend": ...}``,
+naming the model that produced the labels. A label is null when classification
+failed.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+MAX_BATCH = 32  # Texts per forward pass
+MAX_WAIT_MS = 10  # How long the first text of a batch may wait for company
+CLIENT_TIMEOUT = 30  # Seconds a client waits for its labels
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def parse_address(address):
+    """Return (family, target) for 'host:port' or 'unix:/path' addresses."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class MicroBatcher:
+    """Collects texts from many callers and classifies them in shared batches."""
+
+    def __init__(self, pipeline, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.pipeline = pipeline
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.texts = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, texts):
+        futures = []
+        for text in texts:
+            future = Future()
+            self.queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Similar lengths together keep padding small
+            batch.sort(key=lambda item: len(item[0]))
+            try:
+                results = self.pipeline([text for text, _ in batch], batch_size=len(batch), truncation=True)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result["label"])
+            except Exception as e:
+                logging.error(f"❌ Micro-batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    future.set_result(None)
+            self.batches += 1
+            self.texts += len(batch)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_LINE_BYTES)
+            if not line:
+                return
+            try:
+                texts = json.loads(line)["texts"]
+                futures = self.server.batcher.submit([str(t) for t in texts])
+                labels = [future.result(timeout=CLIENT_TIMEOUT) for future in futures]
+                reply = {"labels": labels, **self.server.model_info}
+            except Exception as e:
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def serve(address=DEFAULT_ADDRESS, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+    from utils import get_sentiment_pipeline, SENTIMENT_MODEL, SENTIMENT_BACKEND
+
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.remove(target)
+        server = _UnixServer(target, _Handler)
+    else:
+        server = _TCPServer(target, _Handler)
+    server.model_info = {"model": SENTIMENT_MODEL, "backend": SENTIMENT_BACKEND}
+    server.batcher = MicroBatcher(get_sentiment_pipeline(), max_batch=max_batch, max_wait_ms=max_wait_ms)
+    logging.info(f"🚀 Sentiment server ({SENTIMENT_BACKEND}) listening on {address}, max_batch={max_batch}, max_wait={max_wait_ms}ms")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info(f"Served {server.batcher.texts} texts in {server.batcher.batches} batches")
+
+
+class InferenceClient:
+    """Thread-safe client keeping one persistent connection per thread."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=CLIENT_TIMEOUT):
+        self.family, self.target = parse_address(address)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.target)
+            except OSError:
+                sock.close()
+                raise
+            conn = (sock, sock.makefile("rb"))
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+            self._local.conn = None
+
+    def classify(self, texts):
+        """Return (labels, model, backend): one label (or None) per text and the model that produced them.
+
+        Raises OSError if the server is unreachable.
+        """
+        sock, reader = self._connection()
+        try:
+            sock.sendall(json.dumps({"texts": list(texts)}).encode("utf-8") + b"\n")
+            line = reader.readline(MAX_LINE_BYTES)
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError("Sentiment server closed the connection")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply["labels"], reply.get("model"), reply.get("backend")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--address", default=os.environ.get("SENTIMENT_SERVER") or DEFAULT_ADDRESS)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+    serve(args.address, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
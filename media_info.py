@@ -0,0 +1,96 @@
+"""Read audio durations in-process, without spawning ffprobe."""
+import logging
+import os
+import wave
+
+# Bitrates in kbps indexed by [version is MPEG-1][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+# Sample rates indexed by the 2-bit version field (1 is reserved)
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_LAYERS = {3: 1, 2: 2, 1: 3}
+
+
+def _frame_header(data, offset):
+    """Return (frame length, samples, sample rate) for an MPEG audio frame header at ``offset``, or None."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 0x3
+    layer = _LAYERS.get((data[offset + 1] >> 1) & 0x3)
+    bitrate_index = data[offset + 2] >> 4
+    rate_index = (data[offset + 2] >> 2) & 0x3
+    if version == 1 or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (data[offset + 2] >> 1) & 0x1
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    samples = 1152 if layer == 2 or mpeg1 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def _skip_tags(data, offset):
+    while True:
+        if data[offset:offset + 3] == b"ID3" and offset + 10 <= len(data):
+            # ID3v2 sizes are "syncsafe": 7 bits per byte
+            size = 0
+            for byte in data[offset + 6:offset + 10]:
+                size = (size << 7) | (byte & 0x7F)
+            offset += 10 + size
+        elif data[offset:offset + 3] == b"TAG":
+            offset += 128
+        else:
+            return offset
+
+
+def mp3_duration(data):
+    """Duration in seconds of MP3 bytes, summed over every frame header.
+
+    Walking all frames (rather than trusting the first frame or a Xing header)
+    keeps concatenated clips such as chunked TTS output correct.
+    """
+    offset, seconds = 0, 0.0
+    while offset < len(data):
+        offset = _skip_tags(data, offset)
+        header = _frame_header(data, offset)
+        if header is None or header[0] <= 0:
+            offset += 1  # Resynchronise on the next frame
+            continue
+        length, samples, sample_rate = header
+        # Xing/Info frames carry encoder metadata, not audio
+        if b"Xing" not in data[offset:offset + 64] and b"Info" not in data[offset:offset + 64]:
+            seconds += samples / sample_rate
+        offset += length
+    return seconds
+
+
+def wav_duration(path):
+    with wave.open(path, "rb") as reader:
+        return reader.getnframes() / reader.getframerate()
+
+
+def audio_duration(path):
+    """Duration in seconds of an MP3 or WAV file; other formats fall back to ffprobe."""
+    suffix = os.path.splitext(path)[1].lower()
+    try:
+        if suffix == ".mp3":
+            with open(path, "rb") as f:
+                return mp3_duration(f.read())
+        if suffix == ".wav":
+            return wav_duration(path)
+    except Exception as e:
+        logging.warning(f"⚠️ Could not read duration of {path} in-process: {e}")
+    import ffmpeg
+    return float(ffmpeg.probe(path)["format"]["duration"])
@@ -0,0 +1,228 @@
+from html.parser import HTMLParser
+import functools
+import logging
+
+NO_SUMMARY = "No summary available"
+
+# Elements that never have a closing tag, so they must not be pushed on the stack
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+def _make_card(title, link, summary):
+    return {"title": title, "link": link or "#", "summary": summary or NO_SUMMARY}
+
+
+def parse_cards_bs4(html):
+    """Reference backend: full BeautifulSoup tree with html.parser."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for card in soup.find_all("div", class_="news-card") or soup.select("div.t_s"):
+        title_tag = card.select_one("a.title") or card.select_one("h2 > a") or card.find("a")
+        summary_tag = card.find("div", class_="snippet") or card.find("div", class_="news-card-snippet") or card.find("p")
+        title = title_tag.text.strip() if title_tag else ""
+        summary = summary_tag.text.strip() if summary_tag and summary_tag.text else ""
+        cards.append(_make_card(title, title_tag.get("href") if title_tag else None, summary))
+    return cards
+
+
+def _class_xpath(tag, name):
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+@functools.lru_cache(maxsize=None)
+def _lxml_queries():
+    from lxml import etree
+
+    xp = etree.XPath
+    return {
+        "cards": xp(f"//{_class_xpath('div', 'news-card')}"),
+        "fallback_cards": xp(f"//{_class_xpath('div', 't_s')}"),
+        "title": [xp(f".//{_class_xpath('a', 'title')}"), xp(".//h2/a"), xp(".//a")],
+        "summary": [xp(f".//{_class_xpath('div', 'snippet')}"), xp(f".//{_class_xpath('div', 'news-card-snippet')}"), xp(".//p")],
+    }
+
+
+def parse_cards_lxml(html):
+    """libxml2 backend using precompiled XPath lookups."""
+    from lxml import html as lxml_html
+
+    queries = _lxml_queries()
+
+    def first(card, paths):
+        for path in paths:
+            found = path(card)
+            if found:
+                return found[0]
+        return None
+
+    if not html or not html.strip():
+        return []
+    root = lxml_html.fromstring(html)
+    title_paths, summary_paths = queries["title"], queries["summary"]
+    cards = []
+    for card in queries["cards"](root) or queries["fallback_cards"](root):
+        title_tag = first(card, title_paths)
+        summary_tag = first(card, summary_paths)
+        title = title_tag.text_content().strip() if title_tag is not None else ""
+        summary = summary_tag.text_content().strip() if summary_tag is not None else ""
+        cards.append(_make_card(title, title_tag.get("href") if title_tag is not None else None, summary))
+    return cards
+
+
+class _CardScanner(HTMLParser):
+    """Single-pass scanner that records only the elements the card extractor needs.
+
+    Text is appended to one flat list; every interesting element remembers the
+    slice of that list it spans, so no tree is ever built.
+    """
+
+    # Roles in priority order; the first element seen for each role in a card wins
+    TITLE_ROLES = ("a.title", "h2>a", "a")
+    SUMMARY_ROLES = ("div.snippet", "div.news-card-snippet", "p")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self.stack = []  # [tag, closers] where closers run when the element ends
+        self.open_cards = []
+        self.cards = {"news-card": [], "t_s": []}
+        self.skip_depth = 0
+
+    def _roles(self, tag, classes, parent):
+        roles = []
+        if tag == "a":
+            if "title" in classes:
+                roles.append("a.title")
+            if parent == "h2":
+                roles.append("h2>a")
+            roles.append("a")
+        elif tag == "div":
+            if "snippet" in classes:
+                roles.append("div.snippet")
+            if "news-card-snippet" in classes:
+                roles.append("div.news-card-snippet")
+        elif tag == "p":
+            roles.append("p")
+        return roles
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        parent = self.stack[-1][0] if self.stack else None
+        closers = []
+        start = len(self.chunks)
+
+        for role in self._roles(tag, classes, parent):
+            for card in self.open_cards:
+                if role not in card["roles"]:
+                    span = [start, None, attrs.get("href")]
+                    card["roles"][role] = span
+                    closers.append(span)
+
+        if tag == "div":
+            for kind in ("news-card", "t_s"):
+                if kind in classes:
+                    card = {"roles": {}}
+                    self.cards[kind].append(card)
+                    self.open_cards.append(card)
+                    closers.append(card)
+
+        if tag in ("script", "style"):
+            self.skip_depth += 1
+        self.stack.append([tag, closers])
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags carry no text, but cards and roles still need a closed span
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if not any(entry[0] == tag for entry in self.stack):
+            return
+        while self.stack:
+            name, closers = self.stack.pop()
+            self._close(name, closers)
+            if name == tag:
+                break
+
+    def _close(self, name, closers):
+        end = len(self.chunks)
+        for closer in closers:
+            if isinstance(closer, dict):
+                self.open_cards.remove(closer)
+            else:
+                closer[1] = end
+        if name in ("script", "style"):
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth and self.open_cards:
+            self.chunks.append(data)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            name, closers = self.stack.pop()
+            self._close(name, closers)
+
+    def text(self, span):
+        return "".join(self.chunks[span[0]:span[1]])
+
+    def results(self):
+        cards = []
+        for card in self.cards["news-card"] or self.cards["t_s"]:
+            roles = card["roles"]
+            title_span = next((roles[r] for r in self.TITLE_ROLES if r in roles), None)
+            summary_span = next((roles[r] for r in self.SUMMARY_ROLES if r in roles), None)
+            title = self.text(title_span).strip() if title_span else ""
+            summary = self.text(summary_span).strip() if summary_span else ""
+            cards.append(_make_card(title, title_span[2] if title_span else None, summary))
+        return cards
+
+
+def parse_cards_stream(html):
+    """Dependency-free backend: one streaming pass with the stdlib HTML tokenizer."""
+    scanner = _CardScanner()
+    scanner.feed(html or "")
+    scanner.close()
+    return scanner.results()
+
+
+PARSER_BACKENDS = {
+    "bs4": parse_cards_bs4,
+    "lxml": parse_cards_lxml,
+    "stream": parse_cards_stream,
+}
+
+
+def default_backend():
+    try:
+        import lxml.html  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "stream"
+
+
+def parse_news_cards(html, backend="auto"):
+    """Extract title, link and summary from every news card on a Bing results page.
+
+    Cards without a title are returned with an empty title so callers can log
+    and skip them.
+    """
+    if backend == "auto":
+        backend = default_backend()
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}', expected one of {sorted(PARSER_BACKENDS)}")
+    try:
+        return PARSER_BACKENDS[backend](html)
+    except ImportError as e:
+        logging.warning(f"⚠️ Parser backend '{backend}' unavailable ({e}), falling back to 'stream'")
+        return parse_cards_stream(html)
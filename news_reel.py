@@ -1,7 +1,7 @@
 import streamlit as st
-import os
 import json
-from utils import scrape_news, generate_news_reel
+from utils import scrape_news, generate_article_summary
+from reel_widgets import submit_reel, show_reel_job, poll_reel_jobs
 
 # --- News Reel Page ---
 st.set_page_config(page_title="News Reel", page_icon="🎥", layout="wide")
@@ -66,26 +66,19 @@ if 'reel_articles' in st.session_state and st.session_state.reel_articles:
     st.markdown(f"<div style='text-align:center; color:#888;'>Reels 1 to {len(filtered_articles)}</div>", unsafe_allow_html=True)
 
     # --- Generate and Show News Reel Video ---
+    # Allow user to upload an image for the reel background
+    st.markdown("#### (Optional) Add a background image for the reel")
+    image_file = st.file_uploader("Upload an image (JPG/PNG)", type=["jpg", "jpeg", "png"], key="reel_bg_image")
     if st.button("🎬 Generate News Reel Video"):
-        with st.spinner("Generating video reel from latest news..."):
-            summary_text = " ".join([a['summary'] for a in filtered_articles if a.get('summary')])
-            # Allow user to upload an image for the reel background
-            st.markdown("#### (Optional) Add a background image for the reel")
-            image_file = st.file_uploader("Upload an image (JPG/PNG)", type=["jpg", "jpeg", "png"], key="reel_bg_image")
-            image_path = None
-            if image_file:
-                image_path = os.path.join("temp_reel_bg.jpg")
-                with open(image_path, "wb") as f:
-                    f.write(image_file.read())
-            video_path = generate_news_reel(
-                text=summary_text,
-                language="en",
-                output_file="news_reel_latest.mp4",
-                image_path=image_path
-            )
-        if os.path.exists(video_path):
-            st.video(video_path)
-            with open(video_path, "rb") as f:
-                st.download_button("⬇️ Download News Reel", f, "news_reel_latest.mp4", mime="video/mp4")
-        else:
-            st.error("❌ Failed to generate news reel.")
+        summary_text = generate_article_summary(filtered_articles)
+        # Rendering runs in the background render queue, so the page stays usable meanwhile
+        submit_reel(
+            "reel_job",
+            image_file=image_file,
+            text=summary_text,
+            language="en",
+        )
+    show_reel_job("reel_job", "news_reel_latest.mp4")
+
+# Keep last: refreshes render progress only after the whole page has been drawn
+poll_reel_jobs()
@@ -1,6 +1,6 @@
 import streamlit as st
-import os
-from utils import scrape_news, generate_news_reel
+from utils import scrape_news
+from reel_widgets import submit_reel, show_reel_job, poll_reel_jobs
 
 st.set_page_config(page_title="News Reels", page_icon="🎬", layout="wide")
 
@@ -76,18 +76,9 @@ if articles:
 
     # --- Generate and Show Reel Video for This Article ---
     if st.button("🎬 Play Reel Video for this News", key=f"play_reel_{reel_index}"):
-        with st.spinner("Generating video reel for this news..."):
-            video_path = generate_news_reel(
-                text=article['summary'],
-                language="en",
-                output_file=f"news_reel_{reel_index}.mp4"
-            )
-        if os.path.exists(video_path):
-            st.video(video_path)
-            with open(video_path, "rb") as f:
-                st.download_button("⬇️ Download This Reel", f, f"news_reel_{reel_index}.mp4", mime="video/mp4")
-        else:
-            st.error("❌ Failed to generate news reel.")
+        # Rendering runs in the background render queue, so the page stays usable meanwhile
+        submit_reel(f"reel_job_{reel_index}", text=article['summary'], language="en")
+    show_reel_job(f"reel_job_{reel_index}", f"news_reel_{reel_index}.mp4", "⬇️ Download This Reel")
 
     # --- Reel Controls (Next/Previous) ---
     col1, col2, col3 = st.columns([1,2,1])
@@ -102,3 +93,6 @@ if articles:
     st.markdown(f"<div style='text-align:center; color:#888;'>Reel {reel_index+1} of {len(articles)}</div>", unsafe_allow_html=True)
 else:
     st.info("No news reels available. Try refreshing or changing the category.")
+
+# Keep last: refreshes render progress only after the whole page has been drawn
+poll_reel_jobs()
@@ -1,6 +1,7 @@
 import streamlit as st
-import os
-from utils import scrape_news, generate_news_reel
+from utils import scrape_news
+from reel_widgets import submit_reel, show_reel_job, poll_reel_jobs
+from render_queue import DONE
 
 # Page config
 st.set_page_config(page_title="News Reels", page_icon="🎬", layout="wide")
@@ -163,41 +164,23 @@ if st.session_state.reels_articles:
     st.markdown("<div class='image-upload'>", unsafe_allow_html=True)
     image_file = st.file_uploader("Upload Background Image (Optional)", type=["jpg", "jpeg", "png"])
     if st.button("🎬 Generate Video Reel", use_container_width=True):
-        with st.spinner("Creating your video reel..."):
-            image_path = None
-            if image_file:
-                image_path = f"temp_bg_{current_idx}.jpg"
-                with open(image_path, "wb") as f:
-                    f.write(image_file.getvalue())
-            
-            video_path = generate_news_reel(
-                text=article['summary'],
-                language="en",
-                output_file=f"news_reel_{current_idx}.mp4",
-                image_path=image_path
-            )
-            
-            if os.path.exists(video_path):
-                st.video(video_path)
-                with open(video_path, "rb") as f:
-                    st.download_button(
-                        "⬇️ Download Reel",
-                        f,
-                        f"news_reel_{current_idx}.mp4",
-                        mime="video/mp4"
-                    )
-                # Display translated text if available
-                if article.get('translated_text'):
-                    st.markdown("#### 📝 Translated Text")
-                    st.markdown(f"<div class='translated-text'>{article['translated_text']}</div>", unsafe_allow_html=True)
-            else:
-                st.error("Failed to generate video reel. Please try again.")
-            
-            # Cleanup
-            if image_path and os.path.exists(image_path):
-                os.remove(image_path)
+        # Rendering runs in the background render queue, so the page stays usable meanwhile
+        submit_reel(
+            f"reel_job_{current_idx}",
+            image_file=image_file,
+            text=article['summary'],
+            language="en",
+        )
+    job = show_reel_job(f"reel_job_{current_idx}", f"news_reel_{current_idx}.mp4", "⬇️ Download Reel")
+    # Display translated text if available
+    if job and job.state == DONE and article.get('translated_text'):
+        st.markdown("#### 📝 Translated Text")
+        st.markdown(f"<div class='translated-text'>{article['translated_text']}</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 else:
     st.info("👆 Choose a category and click 'Refresh' to start viewing news reels")
 
-st.markdown("</div>", unsafe_allow_html=True)  # Close main container
\ No newline at end of file
+st.markdown("</div>", unsafe_allow_html=True)  # Close main container
+
+# Keep last: refreshes render progress only after the whole page has been drawn
+poll_reel_jobs()
@@ -3,7 +3,34 @@ import plotly.express as px
 import pandas as pd
 from collections import Counter
 import requests
-from utils import scrape_news, text_to_speech, comparative_analysis
+from utils import scrape_news, text_to_speech_audio, comparative_analysis, generate_article_summary
+from tts_engines import MIME_TYPES
+
+AUDIO_EXTENSIONS = {mime: suffix for suffix, mime in MIME_TYPES.items()}
+
+
+def speak_summary(summary_text, lang_code):
+    """Play the opening chunk as soon as it is ready, then add the full clip below it.
+
+    The full clip gets its own player, so an opening chunk that is already
+    playing is not interrupted. Returns (audio bytes, mime type, translated text).
+    """
+    first_chunk = {}
+
+    def on_first_chunk(chunk, chunk_mime):
+        first_chunk["audio"] = chunk
+        st.caption("▶️ Opening of the summary, playable while the rest is synthesized")
+        st.audio(chunk, format=chunk_mime)
+
+    audio, mime_type, translated_text = text_to_speech_audio(
+        summary_text, language=lang_code, chunked=True, on_first_chunk=on_first_chunk
+    )
+    # A summary that fits in one chunk is already fully shown by the opening player
+    if audio and audio != first_chunk.get("audio"):
+        if first_chunk:
+            st.caption("🎧 Full summary")
+        st.audio(audio, format=mime_type)
+    return audio, mime_type, translated_text
 
 # Page config
 st.set_page_config(page_title="News Search & Analysis", page_icon="📰", layout="wide")
@@ -186,17 +213,16 @@ if st.button("🔎 Search News"):
                 
                 # Audio Summary
                 st.markdown("### 🎧 Audio Summary")
-                summary_text = " ".join([a['summary'] for a in articles[:3]])
+                summary_text = generate_article_summary(articles)
                 if st.button("🔊 Generate Audio Summary"):
                     with st.spinner(f"Generating {selected_lang_label} audio..."):
-                        audio_file, translated_text = text_to_speech(summary_text, language=lang_code)
-                        if audio_file:
-                            st.audio(audio_file)
+                        audio, mime_type, translated_text = speak_summary(summary_text, lang_code)
+                        if audio:
                             st.download_button(
                                 "⬇️ Download Audio Summary",
-                                open(audio_file, "rb"),
-                                "news_summary.mp3",
-                                "audio/mp3"
+                                audio,
+                                f"news_summary{AUDIO_EXTENSIONS[mime_type]}",
+                                mime_type
                             )
                             st.markdown("#### 📝 Translated Summary")
                             st.markdown(
@@ -377,15 +403,15 @@ if st.session_state.articles:
 
     # Audio Summary
     st.markdown("### 🎧 Audio Summary")
-    summary_text = " ".join([a['summary'] for a in filtered_articles[:3]])
+    summary_text = generate_article_summary(filtered_articles)
     if summary_text:
         if st.button("🔊 Generate Audio Summary"):
             with st.spinner(f"Generating {selected_lang_label} audio..."):
-                audio_file, translated_text = text_to_speech(summary_text, language=lang_code)
-                if audio_file:
-                    st.audio(audio_file)
-                    with open(audio_file, "rb") as f:
-                        st.download_button("⬇️ Download Audio", f, "news_summary.mp3", "audio/mp3")
+                audio, mime_type, translated_text = speak_summary(summary_text, lang_code)
+                if audio:
+                    st.download_button(
+                        "⬇️ Download Audio", audio, f"news_summary{AUDIO_EXTENSIONS[mime_type]}", mime_type
+                    )
                     st.markdown("#### 📝 Translated Text")
                     st.markdown(
                         f"<div class='translated-text'>{translated_text}</div>",
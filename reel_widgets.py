@@ -0,0 +1,82 @@
+"""Streamlit helpers for reels rendered in the background by render_queue."""
+import os
+import tempfile
+import time
+import uuid
+
+import streamlit as st
+
+from render_queue import get_render_queue, QUEUED, DONE, CANCELLED
+
+POLL_SECONDS = 1.0  # How often a waiting page refreshes the job's progress
+_POLL_KEY = "reel_jobs_polling"
+
+
+def session_owner():
+    """Stable id for this browser session, so the queue can share renderers fairly between sessions."""
+    if "render_owner" not in st.session_state:
+        st.session_state.render_owner = uuid.uuid4().hex
+    return st.session_state.render_owner
+
+
+def save_upload(uploaded_file, suffix=".jpg"):
+    """Write an uploaded file to a private temp path that the render job deletes when it is done."""
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix="reel_bg_")
+    with os.fdopen(fd, "wb") as f:
+        f.write(uploaded_file.getvalue())
+    return path
+
+
+def submit_reel(state_key, image_file=None, **options):
+    """Queue a reel and remember its job under ``state_key`` in the session."""
+    cleanup = []
+    if image_file is not None:
+        options["image_path"] = save_upload(image_file)
+        cleanup.append(options["image_path"])
+    job = get_render_queue().submit(session_owner(), cleanup=cleanup, **options)
+    st.session_state[state_key] = job.id
+    return job
+
+
+def show_reel_job(state_key, download_name, download_label="⬇️ Download News Reel"):
+    """Show queue position and progress (with a cancel button) or the finished reel; returns the job.
+
+    Progress is drawn once per script run; call ``poll_reel_jobs`` as the last
+    statement of the page so it refreshes without holding up the rest of the page.
+    """
+    job_id = st.session_state.get(state_key)
+    queue = get_render_queue()
+    job = queue.get(job_id) if job_id else None
+    if job is None:
+        st.session_state.pop(state_key, None)
+        return None
+
+    if not job.finished_state:
+        if job.state == QUEUED:
+            st.info(f"⏳ Waiting for a free renderer ({queue.queue_position(job)} ahead of you)...")
+        else:
+            st.info(f"🎬 Rendering video reel... {job.progress:.0%}")
+        st.progress(job.progress)
+        if st.button("✖️ Cancel Rendering", key=f"{state_key}_cancel"):
+            queue.cancel(job.id)
+            st.rerun()
+        st.session_state[_POLL_KEY] = True
+        return job
+
+    if job.state == DONE and os.path.exists(job.output):
+        st.video(job.output)
+        with open(job.output, "rb") as f:
+            st.download_button(download_label, f, download_name, mime="video/mp4", key=f"{state_key}_download")
+    elif job.state == CANCELLED:
+        st.warning("Rendering cancelled.")
+    else:
+        st.error("❌ Failed to generate news reel.")
+    return job
+
+
+def poll_reel_jobs():
+    """Rerun the page shortly if a reel shown in this run is still rendering; call it last on the page."""
+    if st.session_state.pop(_POLL_KEY, False):
+        # Clicking any widget meanwhile starts a new run at once; the render carries on in the pool
+        time.sleep(POLL_SECONDS)
+        st.rerun()
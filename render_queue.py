@@ -0,0 +1,235 @@
+"""Background news reel rendering.
+
+Reels are encoded in a process pool so Streamlit sessions stay responsive
+while ffmpeg runs. At most ``RENDER_WORKERS`` reels encode at once; queued
+jobs are handed out round-robin across owners (one owner per Streamlit
+session), so one user queueing many reels cannot starve everyone else.
+"""
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+JOB_TTL = 60 * 60  # Seconds finished jobs stay visible before they are forgotten
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class RenderJob:
+    def __init__(self, owner, options, cleanup=()):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.options = options
+        self.cleanup = list(cleanup)
+        self.state = QUEUED
+        self.output = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._queue = None
+
+    @property
+    def progress(self):
+        if self.state == DONE:
+            return 1.0
+        if self.state != RUNNING or self._queue is None:
+            return 0.0
+        return self._queue.progress_of(self.id)
+
+    @property
+    def finished_state(self):
+        return self.state in FINISHED_STATES
+
+
+def _render(job_id, options, progress, cancelled):
+    """Worker-process entry point; returns the output path, or None if the job was cancelled."""
+    from utils import generate_news_reel
+
+    if cancelled.get(job_id):
+        return None
+    output = generate_news_reel(
+        **options,
+        on_progress=lambda fraction: progress.__setitem__(job_id, fraction),
+        should_cancel=lambda: bool(cancelled.get(job_id)),
+    )
+    if cancelled.get(job_id):
+        return None
+    if not output:
+        raise RuntimeError("Reel rendering failed; see the worker log for the ffmpeg output")
+    return output
+
+
+class RenderQueue:
+    def __init__(self, max_workers=RENDER_WORKERS):
+        self.max_workers = max_workers
+        # "spawn" keeps worker processes independent of the threads running in the web server
+        self._context = multiprocessing.get_context("spawn")
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=self._context)
+        self._manager = self._context.Manager()
+        self._progress = self._manager.dict()
+        self._cancelled = self._manager.dict()
+        self._jobs = {}
+        self._pending = OrderedDict()  # owner -> deque of queued jobs, in round-robin order
+        self._running = 0
+        self._lock = threading.Lock()
+        # Give each encode a fair share of the cores instead of letting every x264 grab all of them
+        self._threads = max(1, (os.cpu_count() or 1) // max_workers)
+
+    def submit(self, owner, cleanup=(), **options):
+        """Queue a ``generate_news_reel`` call; ``cleanup`` files are deleted once the job finishes."""
+        from utils import find_cached_reel
+
+        job = RenderJob(owner, dict(options, threads=options.get("threads") or self._threads), cleanup)
+        job._queue = self
+        # A reel that is already in the reel cache is returned at once instead of waiting for a worker
+        cached = None if options.get("output_file") else find_cached_reel(**options)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            if cached:
+                job.output = cached
+                self._finish(job, DONE)
+                return job
+            self._pending.setdefault(owner, deque()).append(job)
+        self._dispatch()
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def queue_position(self, job):
+        """Number of jobs that will start before ``job``, counting round-robin turns."""
+        with self._lock:
+            if job.state != QUEUED:
+                return 0
+            queues = [list(jobs) for jobs in self._pending.values()]
+        position = 0
+        for turn in itertools.count():
+            for jobs in queues:
+                if turn < len(jobs):
+                    if jobs[turn] is job:
+                        return position
+                    position += 1
+            if all(turn >= len(jobs) for jobs in queues):
+                return position
+
+    def progress_of(self, job_id):
+        try:
+            return self._progress.get(job_id, 0.0)
+        except Exception:
+            return 0.0
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished_state:
+                return False
+            if job.state == QUEUED:
+                self._pending[job.owner].remove(job)
+                if not self._pending[job.owner]:
+                    del self._pending[job.owner]
+                self._finish(job, CANCELLED)
+                return True
+        # Running: the worker kills ffmpeg the next time it reports progress
+        self._cancelled[job_id] = True
+        return True
+
+    def _next_job(self):
+        if not self._pending:
+            return None
+        owner, jobs = next(iter(self._pending.items()))
+        job = jobs.popleft()
+        del self._pending[owner]
+        if jobs:
+            self._pending[owner] = jobs  # Back of the line until every other owner had a turn
+        return job
+
+    def _dispatch(self):
+        started = []
+        with self._lock:
+            while self._running < self.max_workers:
+                job = self._next_job()
+                if job is None:
+                    break
+                job.state = RUNNING
+                self._running += 1
+                pool = self._pool
+                try:
+                    future = pool.submit(_render, job.id, job.options, self._progress, self._cancelled)
+                except BrokenProcessPool as e:
+                    self._running -= 1
+                    logging.error(f"❌ Render job {job.id} failed: {e}")
+                    job.error = str(e)
+                    self._finish(job, FAILED)
+                    self._restart_pool(pool)
+                    continue
+                started.append((job, pool, future))
+        # Outside the lock: a future that is already done runs its callback right here, and that takes the lock
+        for job, pool, future in started:
+            future.add_done_callback(lambda future, job=job, pool=pool: self._completed(job, pool, future))
+
+    def _completed(self, job, pool, future):
+        with self._lock:
+            self._running -= 1
+            try:
+                output = future.result()
+                if output is None:
+                    self._finish(job, CANCELLED)
+                else:
+                    job.output = output
+                    self._finish(job, DONE)
+            except Exception as e:
+                logging.error(f"❌ Render job {job.id} failed: {e}")
+                job.error = str(e)
+                self._finish(job, FAILED)
+                if isinstance(e, BrokenProcessPool):
+                    self._restart_pool(pool)
+        self._dispatch()
+
+    def _restart_pool(self, broken):
+        """Replace a pool broken by a crashed worker; every job running on it fails once, but only one restart happens."""
+        if broken is not self._pool:
+            return
+        logging.warning("⚠️ A render worker died; starting a new process pool")
+        broken.shutdown(wait=False)
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+
+    def _finish(self, job, state):
+        job.state = state
+        job.finished = time.time()
+        self._progress.pop(job.id, None)
+        self._cancelled.pop(job.id, None)
+        for path in job.cleanup:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _prune(self):
+        cutoff = time.time() - JOB_TTL
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+
+_render_queue = None
+_render_queue_lock = threading.Lock()
+
+
+def get_render_queue():
+    """Return the process-wide render queue, shared by every Streamlit session."""
+    global _render_queue
+    with _render_queue_lock:
+        if _render_queue is None:
+            _render_queue = RenderQueue()
+    return _render_queue
@@ -2,7 +2,8 @@ from apscheduler.schedulers.background import BackgroundScheduler
 import json
 import os
 import shutil
-from utils import scrape_news, text_to_speech
+from utils import scrape_news_as_completed, text_to_speech, warm_up
+from text_analysis import NearDuplicateIndex
 import logging
 from datetime import datetime
 
@@ -16,6 +17,7 @@ ALERTS_FILE = os.path.join(BASE_DIR, "alerts.json")
 NOTIFICATIONS_FILE = os.path.join(BASE_DIR, "notifications.json")
 CHECK_INTERVAL = 3600  # Check every hour (in seconds)
 MAX_NOTIFICATIONS = 50  # Maximum number of notifications to keep
+SCRAPE_CONCURRENCY = 16  # Alert terms fetched from Bing at the same time
 
 # Ensure audio directory exists
 if not os.path.exists(AUDIO_DIR):
@@ -50,9 +52,11 @@ def check_news():
     notifications = load_json(NOTIFICATIONS_FILE)
     current_time = datetime.now().isoformat()
 
-    for term in alerts:
-        logging.info(f"Checking news for alert: {term}")
-        articles = scrape_news(term)
+    logging.info(f"Checking news for {len(alerts)} alerts")
+    # Syndicated stories shared by several alert terms are only enriched once per cycle
+    dedup_index = NearDuplicateIndex()
+    for term, articles in scrape_news_as_completed(alerts, max_concurrency=SCRAPE_CONCURRENCY, dedup_index=dedup_index):
+        logging.info(f"Checked news for alert: {term}")
         if articles:
             existing_titles = {n['message'].split(': ')[-1] for n in notifications if n['term'] == term}
             new_articles = [a for a in articles if a['title'] not in existing_titles]
@@ -61,9 +65,9 @@ def check_news():
                 summary_text = " ".join([a['summary'] for a in new_articles[:1]])
                 temp_audio, translated_text = text_to_speech(summary_text, language='en')
                 if temp_audio:
-                    # Move audio to a persistent location
-                    audio_file = os.path.join(AUDIO_DIR, f"alert_{term}_{current_time.replace(':', '-')}.mp3")
-                    shutil.move(temp_audio, audio_file)
+                    # Copy audio to a persistent location; the original stays in the audio cache
+                    audio_file = os.path.join(AUDIO_DIR, f"alert_{term}_{current_time.replace(':', '-')}{os.path.splitext(temp_audio)[1]}")
+                    shutil.copyfile(temp_audio, audio_file)
                     
                     notification = {
                         "term": term,
@@ -79,6 +83,7 @@ def check_news():
     save_notifications(notifications)
 
 if __name__ == "__main__":
+    warm_up(speech=True)
     scheduler = BackgroundScheduler()
     scheduler.add_job(check_news, 'interval', seconds=CHECK_INTERVAL)
     scheduler.start()
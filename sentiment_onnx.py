@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from cache import CACHE_DIR
+
+ONNX_MODEL_DIR = os.path.join(CACHE_DIR, "onnx")
+ONNX_THREADS = int(os.environ.get("ONNX_THREADS", "0"))  # 0 lets onnxruntime pick
+MAX_SEQUENCE_LENGTH = 512
+EXPORT_FILES = ("model.onnx", "model-int8.onnx", "labels.json", "tokenizer_config.json")
+
+
+def model_dir(model_id):
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "__"))
+
+
+def is_exported(directory):
+    return all(os.path.exists(os.path.join(directory, name)) for name in EXPORT_FILES)
+
+
+def export_quantized_model(model_id, output_dir=None):
+    """Export a Hugging Face sequence classifier to ONNX and quantize its weights to int8.
+
+    Writes ``model.onnx``, ``model-int8.onnx``, the tokenizer files and a
+    ``labels.json`` with the id-to-label mapping into ``output_dir``. The files
+    are written to a temporary directory that is renamed into place once
+    complete, so processes starting together never load a half-written export.
+    """
+    output_dir = output_dir or model_dir(model_id)
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=".export-", dir=parent)
+    try:
+        _export(model_id, work_dir)
+        if os.path.exists(output_dir) and not is_exported(output_dir):
+            # Left behind by an export that was interrupted before exports were atomic
+            shutil.rmtree(output_dir, ignore_errors=True)
+        try:
+            os.replace(work_dir, output_dir)
+        except OSError:
+            # Another process finished first; its export is complete, so keep it
+            logging.info(f"ONNX model already exported to {output_dir} by another process")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    int8_path = os.path.join(output_dir, "model-int8.onnx")
+    logging.info(f"✅ Exported int8 ONNX model to {int8_path}")
+    return int8_path
+
+
+def _export(model_id, output_dir):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id)
+    model.eval()
+
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    int8_path = os.path.join(output_dir, "model-int8.onnx")
+    sample = tokenizer(["warm up sentence"], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=14,
+        )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, "labels.json"), "w") as f:
+        json.dump({int(k): v for k, v in model.config.id2label.items()}, f)
+
+
+class OnnxSentimentPipeline:
+    """Drop-in replacement for the transformers sentiment pipeline backed by onnxruntime.
+
+    Accepts a string or a list of strings and returns ``[{"label", "score"}]``
+    like ``pipeline("sentiment-analysis")``.
+    """
+
+    def __init__(self, model_id, quantized=True):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        directory = model_dir(model_id)
+        model_file = "model-int8.onnx" if quantized else "model.onnx"
+        if not is_exported(directory):
+            export_quantized_model(model_id, directory)
+
+        options = onnxruntime.SessionOptions()
+        if ONNX_THREADS:
+            options.intra_op_num_threads = ONNX_THREADS
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(directory, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        with open(os.path.join(directory, "labels.json")) as f:
+            self.id2label = {int(k): v for k, v in json.load(f).items()}
+        # InferenceSession.run is thread-safe, but the fast tokenizer is not
+        self._tokenizer_lock = threading.Lock()
+
+    def __call__(self, texts, batch_size=None, truncation=True, **kwargs):
+        import numpy as np
+
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        batch_size = batch_size or len(texts) or 1
+        results = []
+        for start in range(0, len(texts), batch_size):
+            with self._tokenizer_lock:
+                encoded = self.tokenizer(
+                    texts[start:start + batch_size],
+                    padding=True,
+                    truncation=truncation,
+                    max_length=MAX_SEQUENCE_LENGTH,
+                    return_tensors="np",
+                )
+            logits = self.session.run(
+                ["logits"],
+                {
+                    "input_ids": encoded["input_ids"].astype(np.int64),
+                    "attention_mask": encoded["attention_mask"].astype(np.int64),
+                },
+            )[0]
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            for row in probs:
+                best = int(row.argmax())
+                results.append({"label": self.id2label[best], "score": float(row[best])})
+        return results
@@ -0,0 +1,67 @@
+"""Timed subtitle tracks for news reels, burned in with ffmpeg's ``subtitles`` filter."""
+import textwrap
+
+LINE_WIDTH = 40  # Characters per subtitle line
+BOTTOM_MARGIN = 100  # Pixels between the subtitle baseline and the bottom of the frame
+
+_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: {width}
+PlayResY: {height}
+WrapStyle: 2
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,{font_name},{font_size},&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,2,20,20,{margin},1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+def ass_timestamp(seconds):
+    centiseconds = int(round(seconds * 100))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    secs, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
+
+
+def escape_ass_text(text):
+    # A word joiner after each backslash stops \N, \h and friends; braces would open override blocks
+    return " ".join(text.replace("\\", "\\\u2060").replace("{", "\\{").replace("}", "\\}").split())
+
+
+def timed_lines(text, duration, width=LINE_WIDTH):
+    """Wrap text and give each line a share of ``duration`` proportional to its length."""
+    lines = textwrap.wrap(text, width=width)
+    total = sum(len(line) for line in lines) or 1
+    timed, start = [], 0.0
+    for line in lines:
+        end = start + duration * len(line) / total
+        timed.append((start, end, line))
+        start = end
+    return timed
+
+
+def build_ass(text, duration, font_name, font_size=30, width=720, height=1280, line_width=LINE_WIDTH):
+    """Return an ASS subtitle document showing the text one wrapped line at a time over ``duration``."""
+    events = [
+        f"Dialogue: 0,{ass_timestamp(start)},{ass_timestamp(end)},Default,,0,0,0,,{escape_ass_text(line)}"
+        for start, end, line in timed_lines(text, duration, line_width)
+    ]
+    header = _HEADER.format(width=width, height=height, font_name=font_name, font_size=font_size, margin=BOTTOM_MARGIN)
+    return header + "\n".join(events) + "\n"
+
+
+def escape_filter_path(path):
+    """Quote a file path for use as an ffmpeg filter option value."""
+    return "'" + path.replace("\\", "/").replace(":", "\\:").replace("'", "'\\''") + "'"
+
+
+def subtitles_filter(subtitle_path, fonts_dir=None):
+    value = f"subtitles=filename={escape_filter_path(subtitle_path)}"
+    if fonts_dir:
+        value += f":fontsdir={escape_filter_path(fonts_dir)}"
+    return value
@@ -0,0 +1,327 @@
+import functools
+import hashlib
+import random
+import re
+import threading
+import zlib
+
+from news_parser import NO_SUMMARY
+
+_TOKEN = re.compile(r"\w+")
+
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32  # 32 bands of 4 rows: pairs above ~0.42 Jaccard usually share a band
+NEAR_DUPLICATE_SIMILARITY = 0.8  # Estimated content-word Jaccard at which two texts are the same story
+TITLE_ONLY_SIMILARITY = 0.95  # Headlines alone are short, so one changed word ("rise"/"fall") must not match
+
+VECTOR_DIM = 1 << 12  # Hashed feature space shared by all text vectors
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his in is it its "
+    "of on or our she that the their they this to was we were will with you your "
+    "after about over into new says said than more".split()
+)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # Fixed seed so signatures are comparable across processes
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(text):
+    """MinHash signature of the set of content words (stopwords removed) in a text.
+
+    Word sets rather than shingles suit short headline/snippet text, where a
+    single edited word would change a large share of the shingles. Stopwords
+    are left out because they are shared by unrelated headlines and would
+    inflate their similarity.
+    """
+    hashes = [_token_hash(token) for token in set(content_tokens(text))]
+    if not hashes:
+        return (0,) * MINHASH_PERMUTATIONS
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimated_similarity(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """Thread-safe MinHash LSH index.
+
+    Signatures are split into bands and only signatures sharing a band are
+    compared, so lookups stay cheap as the index grows over a whole scheduler
+    cycle.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_SIMILARITY, bands=LSH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = MINHASH_PERMUTATIONS // bands
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def find(self, signature, threshold=None):
+        """Return the item stored under the most similar signature above the threshold, or None.
+
+        A pair must clear the index threshold and the stricter of the two
+        signatures' own thresholds.
+        """
+        threshold = max(self.threshold, threshold or 0)
+        best, best_similarity = None, 0
+        with self._lock:
+            for key in self._keys(signature):
+                for other, item, other_threshold in self._buckets.get(key, ()):
+                    similarity = estimated_similarity(signature, other)
+                    if similarity >= max(threshold, other_threshold or 0) and similarity > best_similarity:
+                        best, best_similarity = item, similarity
+        return best
+
+    def add(self, signature, item, threshold=None):
+        with self._lock:
+            for key in self._keys(signature):
+                self._buckets.setdefault(key, []).append((signature, item, threshold))
+
+
+def article_signature(article):
+    """Return (signature, threshold) for an article's title and summary."""
+    summary = article.get("summary", "")
+    if summary == NO_SUMMARY:
+        # The placeholder would make every snippet-less article look alike, so only the title counts
+        return minhash(article["title"]), TITLE_ONLY_SIMILARITY
+    return minhash(f"{article['title']} {summary}"), NEAR_DUPLICATE_SIMILARITY
+
+
+@functools.lru_cache(maxsize=65536)
+def _feature_index(token):
+    return zlib.crc32(token.encode("utf-8")) % VECTOR_DIM
+
+
+def content_tokens(text):
+    return [t for t in tokenize(text) if len(t) > 1 and t not in STOPWORDS]
+
+
+def term_counts(texts):
+    """Dense (len(texts), VECTOR_DIM) matrix of hashed term counts."""
+    import numpy as np
+
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        indices = [_feature_index(token) for token in content_tokens(text)]
+        cols.extend(indices)
+        rows.extend([i] * len(indices))
+    counts = np.zeros((len(texts), VECTOR_DIM), dtype=np.float32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    return counts
+
+
+def l2_normalize(matrix):
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def tfidf_vectors(texts):
+    """L2-normalised sublinear TF-IDF vectors over hashed terms, one row per text."""
+    import numpy as np
+
+    counts = term_counts(texts)
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+    return l2_normalize((np.log1p(counts) * idf).astype(np.float32))
+
+
+def similarity_matrix(texts):
+    """Pairwise cosine similarity of the texts' TF-IDF vectors."""
+    vectors = tfidf_vectors(texts)
+    return vectors @ vectors.T
+
+
+def connected_clusters(adjacency):
+    """Label connected components of a boolean adjacency matrix; labels are the smallest member index."""
+    import numpy as np
+
+    n = len(adjacency)
+    adjacency = adjacency | np.eye(n, dtype=bool)
+    labels = np.arange(n)
+    while True:
+        # Take the smallest neighbouring label, then jump pointers to speed up convergence
+        updated = np.where(adjacency, labels[None, :], n).min(axis=1)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_INITIAL = re.compile(r"(?:^|[\s.(])[A-Za-z]\.[\"')\]]*$")  # "J.", "U.S.", "e.g."
+ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof sr jr st mt vs etc inc corp ltd co no gov sen rep gen lt col sgt "
+    "jan feb mar apr jun jul aug sep sept oct nov dec".split()
+)
+MIN_SENTENCE_CHARS = 25
+SENTENCE_CACHE_SIZE = 50000  # Sparse sentence vectors kept in memory
+CHARS_PER_SECOND = 15  # Rough speaking rate used to turn a time budget into characters
+
+
+def _ends_with_abbreviation(text):
+    if _INITIAL.search(text):
+        return True
+    last = text.split()[-1].rstrip("\"')]")
+    return last.endswith(".") and last[:-1].lstrip("\"'([").lower() in ABBREVIATIONS
+
+
+def split_sentences(text, min_chars=MIN_SENTENCE_CHARS):
+    """Split text into sentences of at least ``min_chars`` characters.
+
+    Periods after abbreviations and initials ("Mr.", "U.S.") do not end a
+    sentence. Fragments shorter than ``min_chars`` are joined to the next
+    sentence (the last one to the previous); only paragraphs shorter than
+    ``min_chars`` as a whole, such as bylines, are dropped.
+    """
+    sentences = []
+    for paragraph in text.splitlines():
+        pieces = []
+        for piece in _SENTENCE_END.split(paragraph):
+            piece = " ".join(piece.split())
+            if not piece:
+                continue
+            if pieces and _ends_with_abbreviation(pieces[-1]):
+                pieces[-1] += " " + piece
+            else:
+                pieces.append(piece)
+        merged, carry = [], ""
+        for piece in pieces:
+            piece = f"{carry} {piece}" if carry else piece
+            if len(piece) < min_chars:
+                carry = piece
+            else:
+                merged.append(piece)
+                carry = ""
+        if carry and merged:
+            merged[-1] += " " + carry
+        sentences.extend(merged)
+    return sentences
+
+
+class _SentenceVectorCache:
+    """LRU cache of sparse hashed term-count vectors keyed by sentence hash."""
+
+    def __init__(self, max_entries=SENTENCE_CACHE_SIZE):
+        from collections import OrderedDict
+
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sentence):
+        key = hashlib.blake2b(sentence.lower().encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+            self.misses += 1
+        counts = {}
+        for token in content_tokens(sentence):
+            index = _feature_index(token)
+            counts[index] = counts.get(index, 0) + 1
+        vector = (tuple(counts), tuple(counts.values()))
+        with self._lock:
+            self._entries[key] = vector
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return vector
+
+
+sentence_vectors = _SentenceVectorCache()
+
+
+def _sentence_matrix(sentences):
+    import numpy as np
+
+    counts = np.zeros((len(sentences), VECTOR_DIM), dtype=np.float32)
+    for row, sentence in enumerate(sentences):
+        indices, values = sentence_vectors.get(sentence)
+        if indices:
+            counts[row, list(indices)] = values
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    return l2_normalize((np.log1p(counts) * idf).astype(np.float32))
+
+
+def summarize_extractive(texts, max_chars=600, max_seconds=None, redundancy=0.5, damping=0.85):
+    """Pick the most central, non-redundant sentences from several texts (TextRank).
+
+    Sentences are ranked by PageRank over their cosine-similarity graph, with a
+    mild preference for lead sentences. They are then chosen greedily while
+    skipping any sentence more than ``redundancy`` similar to one already
+    chosen, until ``max_chars`` (or ``max_seconds`` of speech) is used up.
+    The chosen sentences keep their original order.
+    """
+    import numpy as np
+
+    if max_seconds is not None:
+        max_chars = min(max_chars, int(max_seconds * CHARS_PER_SECOND))
+    sentences, positions = [], []
+    seen = set()
+    for text in texts:
+        for position, sentence in enumerate(split_sentences(text or "")):
+            if sentence.lower() not in seen:
+                seen.add(sentence.lower())
+                sentences.append(sentence)
+                positions.append(position)
+    if not sentences:
+        return ""
+    if len(sentences) == 1:
+        return sentences[0][:max_chars]
+
+    vectors = _sentence_matrix(sentences)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    n = len(sentences)
+    # Sentences with no neighbours jump uniformly, keeping the matrix stochastic
+    transition = np.where(row_sums > 0, similarity / np.where(row_sums > 0, row_sums, 1.0), 1.0 / n)
+    preference = 1.0 / (1.0 + np.asarray(positions, dtype=np.float64))
+    preference /= preference.sum()
+    scores = np.full(n, 1.0 / n)
+    for _ in range(50):
+        updated = (1 - damping) * preference + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+
+    chosen, used = [], 0
+    for index in np.argsort(-scores):
+        length = len(sentences[index]) + (1 if chosen else 0)
+        if used + length > max_chars:
+            continue
+        if chosen and similarity[index, chosen].max() > redundancy:
+            continue
+        chosen.append(int(index))
+        used += length
+    if not chosen:
+        # Even the best sentence is over budget: cut it at a word boundary
+        best = sentences[int(np.argmax(scores))]
+        return best[:max_chars].rsplit(" ", 1)[0]
+    return " ".join(sentences[i] for i in sorted(chosen))
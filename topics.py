@@ -0,0 +1,120 @@
+import functools
+import json
+import logging
+import os
+import re
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TOPICS_FILE = os.environ.get("TOPICS_FILE", os.path.join(BASE_DIR, "topics.json"))
+DEFAULT_TOPIC = "General"
+
+_WORD = re.compile(r"\w+")
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal", "wildcard")
+
+    def __init__(self):
+        self.children = {}
+        self.terminal = False
+        self.wildcard = False
+
+
+def _trie_pattern(node):
+    """Render a character trie as a regex that prefers the longest keyword at each position."""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.children.items())]
+    if node.wildcard:
+        branches.append(r"\w+")
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Trying the longer continuations before stopping here gives longest-match semantics
+    return f"(?:{body})?" if node.terminal else body
+
+
+class TopicMatcher:
+    """Matches a keyword taxonomy against text with one precompiled regex.
+
+    Keywords match whole words, case-insensitively, and should start and end
+    with a letter or digit. A keyword ending in ``*`` also matches words that
+    start with it (``partner*`` matches "partnership").
+    All keywords are merged into a single trie-shaped regex, so the cost per
+    text grows with the text length rather than with the taxonomy size.
+    """
+
+    def __init__(self, taxonomy):
+        self.topics = list(taxonomy)
+        self._keywords = {}  # keyword -> (compiled pattern, set of topics)
+        self._by_first_word = {}  # first word -> literal keywords starting with it
+        self._stems = {}  # wildcard stem -> wildcard keywords
+        root = _TrieNode()
+        for topic, keywords in taxonomy.items():
+            for keyword in keywords:
+                keyword = " ".join(keyword.lower().split())
+                if not keyword or keyword == "*":
+                    continue
+                wildcard = keyword.endswith("*")
+                text = keyword.rstrip("*")
+                if keyword not in self._keywords:
+                    pattern = re.escape(text) + (r"\w*" if wildcard else "") + r"\b"
+                    self._keywords[keyword] = (re.compile(pattern), set())
+                    self._add(root, text, wildcard)
+                    if wildcard:
+                        self._stems.setdefault(text, []).append(keyword)
+                    else:
+                        first = _WORD.match(text)
+                        self._by_first_word.setdefault(first.group() if first else text, []).append(keyword)
+                self._keywords[keyword][1].add(topic)
+        body = _trie_pattern(root)
+        # Zero-width lookahead so overlapping keywords at later positions are still seen
+        self._regex = re.compile(rf"\b(?=({body})\b)") if body else None
+
+    @staticmethod
+    def _add(root, text, wildcard):
+        node = root
+        for ch in text:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.terminal = True
+        node.wildcard = node.wildcard or wildcard
+
+    @functools.lru_cache(maxsize=4096)
+    def _topics_for_match(self, matched):
+        # The regex reports the longest keyword at a position; shorter keywords
+        # starting at the same position are recovered from the indexes here.
+        first = _WORD.match(matched)
+        first_word = first.group() if first else matched
+        candidates = list(self._by_first_word.get(first_word, []))
+        for end in range(1, len(matched) + 1):
+            candidates.extend(self._stems.get(matched[:end], []))
+        topics = set()
+        for keyword in candidates:
+            pattern, keyword_topics = self._keywords[keyword]
+            if pattern.match(matched):
+                topics |= keyword_topics
+        return frozenset(topics)
+
+    def match(self, text):
+        if self._regex is None or not text:
+            return [DEFAULT_TOPIC]
+        found = set()
+        for matched in self._regex.findall(text.lower()):
+            found |= self._topics_for_match(matched)
+        return [topic for topic in self.topics if topic in found] or [DEFAULT_TOPIC]
+
+    def match_batch(self, texts):
+        return [self.match(text) for text in texts]
+
+
+def load_taxonomy(path=TOPICS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def get_topic_matcher(path=TOPICS_FILE):
+    """Load and compile the taxonomy once per process."""
+    try:
+        return TopicMatcher(load_taxonomy(path))
+    except Exception as e:
+        logging.error(f"❌ Could not load topic taxonomy from {path}: {e}")
+        return TopicMatcher({})
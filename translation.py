@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import threading
+
+from cache import DiskCache
+from text_analysis import split_sentences
+
+SOURCE_LANGUAGE = "en"  # Scraped news is English; translating to it is a no-op
+TRANSLATION_BATCH_SIZE = 20  # Sentences joined into one Google Translate request
+TRANSLATION_BATCH_CHARS = 4500  # Stays under the ~5000 characters Google Translate accepts per request
+TRANSLATION_CACHE_MAX_ENTRIES = 200_000
+
+translation_cache = DiskCache("translations", max_entries=TRANSLATION_CACHE_MAX_ENTRIES)
+
+_translator = None
+# googletrans keeps one HTTP client per Translator; it is reused but not shared between threads at once
+_translator_lock = threading.Lock()
+
+
+def _get_translator():
+    global _translator
+    if _translator is None:
+        from googletrans import Translator
+        _translator = Translator()
+    return _translator
+
+
+def _cache_key(sentence, dest):
+    return hashlib.sha256(f"{dest}\0{sentence}".encode("utf-8")).hexdigest()
+
+
+def _chunks(pending):
+    chunk, chars = [], 0
+    for item in pending:
+        if chunk and (len(chunk) == TRANSLATION_BATCH_SIZE or chars + len(item[1]) > TRANSLATION_BATCH_CHARS):
+            yield chunk
+            chunk, chars = [], 0
+        chunk.append(item)
+        chars += len(item[1]) + 1
+    if chunk:
+        yield chunk
+
+
+def _translate_chunk(sentences, dest):
+    """Translate sentences in one request, one per line.
+
+    googletrans sends a separate request for each item of a list, so the
+    sentences are joined with newlines instead and the reply split back. If
+    the reply does not have one line per sentence, each sentence is translated
+    on its own.
+    """
+    translator = _get_translator()
+    if len(sentences) > 1:
+        lines = translator.translate("\n".join(" ".join(s.split()) for s in sentences), dest=dest).text.split("\n")
+        if len(lines) == len(sentences):
+            return [line.strip() for line in lines]
+        logging.warning(f"⚠️ Batched translation returned {len(lines)} lines for {len(sentences)} sentences, retrying one by one")
+    return [translator.translate(sentence, dest=dest).text for sentence in sentences]
+
+
+def translate_sentences(sentences, dest):
+    """Translate sentences in order, only sending ones missing from the shared cache."""
+    if dest == SOURCE_LANGUAGE:
+        return list(sentences)
+    keys = [_cache_key(sentence, dest) for sentence in sentences]
+    translated = translation_cache.get_many(keys)
+    missing = {}
+    for key, sentence in zip(keys, sentences):
+        if key not in translated:
+            missing.setdefault(key, sentence)
+    if missing:
+        fresh = {}
+        for chunk in _chunks(list(missing.items())):
+            with _translator_lock:
+                results = _translate_chunk([sentence for _, sentence in chunk], dest)
+            for (key, _), result in zip(chunk, results):
+                fresh[key] = result
+        translation_cache.set_many(fresh)
+        translated.update(fresh)
+        logging.info(f"🌐 Translated {len(fresh)} new sentences to '{dest}', {len(keys) - len(missing)} from cache")
+    return [translated[key] for key in keys]
+
+
+def translate_text(text, dest):
+    """Translate text to ``dest`` sentence by sentence, reusing cached sentence translations."""
+    if dest == SOURCE_LANGUAGE or not text:
+        return text
+    sentences = split_sentences(text, min_chars=1)
+    return " ".join(translate_sentences(sentences, dest))
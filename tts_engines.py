@@ -0,0 +1,240 @@
+"""Text-to-speech engines behind one interface.
+
+``gtts`` calls Google's online service and writes MP3. ``espeak`` (the
+espeak-ng or espeak command line tool) and ``pyttsx3`` run fully offline and
+write WAV, which makes them suitable for bulk alert audio and air-gapped
+machines.
+
+Engines are tried in order until one succeeds. The default order comes from
+``TTS_ENGINES`` (comma separated). ``TTS_LANGUAGE_ENGINES`` overrides it per
+language, e.g. ``en=espeak,gtts;hi=gtts``.
+"""
+import functools
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+
+DEFAULT_ENGINES = "gtts,espeak,pyttsx3"
+ESPEAK_RATE = 160  # Words per minute for the espeak engine
+ESPEAK_TIMEOUT = 120  # Seconds before an espeak process is killed
+
+MIME_TYPES = {".mp3": "audio/mpeg", ".wav": "audio/wav"}
+
+
+class TTSEngine:
+    """Base class: subclasses set ``name`` and ``suffix`` and implement ``synthesize``.
+
+    ``synthesize`` returns the encoded audio as bytes, so callers decide whether
+    it ever touches disk.
+    """
+
+    name = ""
+    suffix = ""
+
+    def available(self):
+        return True
+
+    def supports(self, language):
+        return True
+
+    def synthesize(self, text, language):
+        raise NotImplementedError
+
+    @property
+    def mime_type(self):
+        return MIME_TYPES[self.suffix]
+
+
+class GTTSEngine(TTSEngine):
+    name = "gtts"
+    suffix = ".mp3"
+
+    @functools.lru_cache(maxsize=None)
+    def available(self):
+        try:
+            import gtts  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @functools.lru_cache(maxsize=None)
+    def _languages(self):
+        try:
+            from gtts.lang import tts_langs
+            return frozenset(tts_langs())
+        except Exception:
+            return None
+
+    def supports(self, language):
+        languages = self._languages()
+        return languages is None or language in languages
+
+    def synthesize(self, text, language):
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakEngine(TTSEngine):
+    name = "espeak"
+    suffix = ".wav"
+
+    @functools.lru_cache(maxsize=None)
+    def _binary(self):
+        return shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self):
+        return self._binary() is not None
+
+    @functools.lru_cache(maxsize=None)
+    def _languages(self):
+        try:
+            output = subprocess.run(
+                [self._binary(), "--voices"], capture_output=True, text=True, timeout=ESPEAK_TIMEOUT
+            ).stdout
+        except Exception:
+            return frozenset()
+        # Rows look like " 5  hi             --/M      Hindi              inc/hi"
+        return frozenset(line.split()[1] for line in output.splitlines()[1:] if len(line.split()) > 1)
+
+    def supports(self, language):
+        languages = self._languages()
+        return language in languages or any(code.startswith(f"{language}-") for code in languages)
+
+    def synthesize(self, text, language):
+        # Text goes in through stdin so long or dash-prefixed text is never parsed as options
+        audio = subprocess.run(
+            [self._binary(), "-v", language, "-s", str(ESPEAK_RATE), "--stdout", "--stdin"],
+            input=text.encode("utf-8"), capture_output=True, timeout=ESPEAK_TIMEOUT, check=True,
+        ).stdout
+        # When streaming, espeak leaves placeholder sizes in the WAV header; rewriting fixes them
+        return concat_audio([audio], self.suffix)
+
+
+class Pyttsx3Engine(TTSEngine):
+    name = "pyttsx3"
+    suffix = ".wav"
+
+    def __init__(self):
+        # The pyttsx3 driver loop is not thread-safe, so calls are serialised
+        self._lock = threading.Lock()
+        self._engine = None
+
+    @functools.lru_cache(maxsize=None)
+    def available(self):
+        # Starting the driver is the only reliable check (pyttsx3 imports fine without libespeak);
+        # the result is cached so a machine without a speech backend is not probed on every request
+        try:
+            with self._lock:
+                self._driver()
+            return True
+        except Exception as e:
+            logging.info(f"pyttsx3 TTS unavailable: {e}")
+            return False
+
+    def _driver(self):
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+        return self._engine
+
+    @staticmethod
+    def _voice_languages(voice):
+        languages = []
+        for value in list(getattr(voice, "languages", None) or []) + [voice.id]:
+            if isinstance(value, bytes):
+                # The espeak driver prefixes the code with a priority byte
+                value = value[1:].decode("utf-8", "ignore")
+            languages.append(str(value).lower())
+        return languages
+
+    @functools.lru_cache(maxsize=64)
+    def _voice_for(self, language):
+        with self._lock:
+            voices = self._driver().getProperty("voices")
+        for voice in voices:
+            for code in self._voice_languages(voice):
+                if code == language or code.startswith(f"{language}-") or code.startswith(f"{language}_"):
+                    return voice.id
+        return None
+
+    def supports(self, language):
+        try:
+            return self._voice_for(language) is not None
+        except Exception:
+            return False
+
+    def synthesize(self, text, language):
+        voice = self._voice_for(language)
+        # pyttsx3 can only write to a named file, so it gets a private scratch directory
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"speech{self.suffix}")
+            with self._lock:
+                driver = self._driver()
+                driver.setProperty("voice", voice)
+                driver.save_to_file(text, path)
+                driver.runAndWait()
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                raise RuntimeError("pyttsx3 produced no audio")
+            with open(path, "rb") as f:
+                return f.read()
+
+
+ENGINES = {engine.name: engine for engine in (GTTSEngine(), EspeakEngine(), Pyttsx3Engine())}
+
+
+def _parse_names(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _language_overrides(value):
+    overrides = {}
+    for entry in value.split(";"):
+        language, _, names = entry.partition("=")
+        if language.strip() and names.strip():
+            overrides[language.strip()] = _parse_names(names)
+    return overrides
+
+
+ENGINE_ORDER = _parse_names(os.environ.get("TTS_ENGINES", DEFAULT_ENGINES))
+LANGUAGE_ENGINES = _language_overrides(os.environ.get("TTS_LANGUAGE_ENGINES", ""))
+
+
+def engine_names(language):
+    """Names of the engines configured for ``language``, without checking that they are installed."""
+    return [name for name in LANGUAGE_ENGINES.get(language, ENGINE_ORDER) if name in ENGINES]
+
+
+def engine_chain(language, names=None):
+    """Installed engines that can speak ``language``, in the order they should be tried."""
+    chain = []
+    for name in names or LANGUAGE_ENGINES.get(language, ENGINE_ORDER):
+        engine = ENGINES.get(name)
+        if engine is None:
+            logging.warning(f"⚠️ Unknown TTS engine '{name}'")
+        elif engine.available() and engine.supports(language):
+            chain.append(engine)
+    return chain
+
+
+def concat_audio(parts, suffix):
+    """Join audio clips of one format into a single clip."""
+    if suffix == ".mp3":
+        # MP3 frames are self-contained, so clips play back-to-back when concatenated
+        return b"".join(parts)
+    if suffix == ".wav":
+        output = io.BytesIO()
+        with wave.open(output, "wb") as writer:
+            for index, part in enumerate(parts):
+                with wave.open(io.BytesIO(part), "rb") as reader:
+                    if index == 0:
+                        writer.setparams(reader.getparams())
+                    writer.writeframes(reader.readframes(reader.getnframes()))
+        return output.getvalue()
+    raise ValueError(f"Cannot concatenate {suffix} audio")
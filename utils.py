@@ -1,61 +1,279 @@
+import hashlib
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import requests
-from bs4 import BeautifulSoup
-from gtts import gTTS
-from transformers import pipeline
-from googletrans import Translator
-import tempfile
 import os
+import shutil
+import tempfile
 import logging
-import ffmpeg
-import textwrap
 import platform
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cache import DiskCache, FileCache, file_digest
+from backgrounds import background_input
+from news_parser import parse_news_cards, NO_SUMMARY
+from article_fetcher import fetch_article_bodies
+from topics import get_topic_matcher
+from text_analysis import NearDuplicateIndex, article_signature, similarity_matrix, connected_clusters, summarize_extractive, split_sentences
+from translation import translate_text, translate_sentences
+from tts_engines import engine_chain, engine_names, concat_audio, MIME_TYPES
+from media_info import audio_duration as audio_duration_of
+from subtitles import build_ass, subtitles_filter
+from inference_server import InferenceClient, DEFAULT_ADDRESS as DEFAULT_SERVER_ADDRESS
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 
-# Setup sentiment analysis pipeline
-sentiment_pipeline = pipeline(
-    "sentiment-analysis",
-    model="distilbert/distilbert-base-uncased-finetuned-sst-2-english"
-)
-
-def scrape_news(company_name):
-    try:
-        logging.info(f"🔍 Fetching news for: {company_name}")
-        query = company_name.replace(" ", "+")
-        url = f"https://www.bing.com/news/search?q={query}&FORM=HDRSC6"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            )
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        articles = []
-        news_cards = soup.find_all("div", class_="news-card") or soup.select("div.t_s")
-        logging.info(f"📰 Found {len(news_cards)} news elements")
-
+# Heavy dependencies (transformers/torch, googletrans, gtts, ffmpeg) are imported
+# on first use so the API, scheduler and Streamlit pages start quickly.
+SENTIMENT_MODEL = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+# "pytorch" runs the transformers pipeline; "onnx" runs an int8-quantized export through onnxruntime
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "pytorch").lower()
+
+# Address of inference_server.py ("host:port" or "unix:/path"); empty disables it
+SENTIMENT_SERVER = os.environ.get("SENTIMENT_SERVER", DEFAULT_SERVER_ADDRESS)
+SENTIMENT_SERVER_RETRY = 30  # Seconds before an unreachable server is tried again
+
+STARTUP_TIMINGS = {}  # Seconds spent importing utils and loading each lazy dependency
+
+_sentiment_pipeline = None
+_sentiment_pipeline_lock = threading.Lock()
+# Scrape threads share one model: concurrent forward passes would fight over the same cores,
+# and the fast tokenizer is not thread-safe, so only one batch runs at a time
+_sentiment_inference_lock = threading.Lock()
+_inference_client = None
+_sentiment_server_retry_at = 0.0
+
+def record_timing(name, started):
+    STARTUP_TIMINGS[name] = round(time.perf_counter() - started, 3)
+    logging.info(f"⏱️ {name} took {STARTUP_TIMINGS[name]:.3f}s")
+
+def build_sentiment_pipeline(backend):
+    if backend == "onnx":
+        try:
+            from sentiment_onnx import OnnxSentimentPipeline
+            return OnnxSentimentPipeline(SENTIMENT_MODEL)
+        except Exception as e:
+            logging.error(f"❌ ONNX sentiment backend unavailable, using PyTorch: {e}")
+    elif backend != "pytorch":
+        logging.warning(f"⚠️ Unknown SENTIMENT_BACKEND '{backend}', using PyTorch")
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+
+def get_sentiment_pipeline():
+    """Build the sentiment pipeline on first use; later calls return the same instance."""
+    global _sentiment_pipeline
+    if _sentiment_pipeline is None:
+        with _sentiment_pipeline_lock:
+            if _sentiment_pipeline is None:
+                started = time.perf_counter()
+                _sentiment_pipeline = build_sentiment_pipeline(SENTIMENT_BACKEND)
+                record_timing("sentiment_model_load", started)
+    return _sentiment_pipeline
+
+def warm_up(sentiment=True, speech=False, video=False):
+    """Load heavy dependencies ahead of the first request instead of during it."""
+    if sentiment:
+        get_sentiment_pipeline()
+    if speech:
+        started = time.perf_counter()
+        engine_chain("en")
+        import googletrans  # noqa: F401
+        record_timing("speech_import", started)
+    if video:
+        started = time.perf_counter()
+        import ffmpeg  # noqa: F401
+        record_timing("ffmpeg_import", started)
+    return dict(STARTUP_TIMINGS)
+
+def __getattr__(name):
+    # Keeps `utils.sentiment_pipeline` working for existing callers without loading it at import
+    if name == "sentiment_pipeline":
+        return get_sentiment_pipeline()
+    raise AttributeError(f"module 'utils' has no attribute '{name}'")
+
+SENTIMENT_BATCH_SIZE = 16  # Texts per forward pass in analyze_sentiment_batch
+HTTP_POOL_SIZE = 16  # Keep-alive connections kept open per host
+SCRAPE_CONCURRENCY = 8  # Default number of terms scraped at once by scrape_news_many
+MAX_NEWS_PAGES = 10  # Result pages iter_news walks at most
+NEWS_PARSER_BACKEND = "auto"  # "lxml", "stream" or "bs4"; "auto" prefers lxml when installed
+
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    )
+}
+
+SEARCH_CACHE_TTL = 15 * 60  # Seconds a cached Bing results page stays fresh
+SEARCH_CACHE_MAX_ENTRIES = 500  # Least recently used pages are evicted beyond this
+
+SENTIMENT_CACHE_MAX_ENTRIES = 200_000  # Cached labels kept across all processes
+
+search_cache = DiskCache("search_pages", ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+sentiment_cache = DiskCache("sentiment", max_entries=SENTIMENT_CACHE_MAX_ENTRIES)
+
+AUDIO_CACHE_MAX_BYTES = int(os.environ.get("AUDIO_CACHE_MAX_BYTES", 500 * 1024 * 1024))
+
+TTS_CHUNK_CHARS = 200  # Target chunk length for chunked synthesis
+TTS_WORKERS = 4  # Chunks synthesized at once
+
+audio_cache = FileCache("audio", max_bytes=AUDIO_CACHE_MAX_BYTES)
+
+REEL_CACHE_MAX_BYTES = int(os.environ.get("REEL_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024))
+reel_cache = FileCache("reels", max_bytes=REEL_CACHE_MAX_BYTES)
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Return the shared requests session so connections to Bing are reused."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            session.headers.update(HTTP_HEADERS)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+    return _http_session
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+def fetch_search_page(company_name, offset=0):
+    """Return the Bing News results HTML for a query, served from the disk cache when fresh."""
+    key = normalize_query(company_name)
+    cache_key = f"{key}|first={offset + 1}" if offset else key
+    html = search_cache.get(cache_key)
+    if html is not None:
+        logging.info(f"⚡ Search cache hit for: {company_name}")
+        return html
+    query = key.replace(" ", "+")
+    url = f"https://www.bing.com/news/search?q={query}&FORM=HDRSC6"
+    if offset:
+        url += f"&first={offset + 1}"
+    response = get_http_session().get(url, timeout=10)
+    if response.ok and response.text:
+        search_cache.set(cache_key, response.text)
+    return response.text
+
+def attach_article_bodies(articles):
+    """Fetch the linked pages concurrently and store their main text under 'body'."""
+    bodies = fetch_article_bodies([a["link"] for a in articles], session=get_http_session())
+    for article in articles:
+        if bodies.get(article["link"]):
+            article["body"] = bodies[article["link"]]
+    return articles
+
+def article_text(article):
+    return article.get("body") or article["summary"]
+
+def enrich_articles(articles, fetch_bodies=False):
+    """Attach topics and sentiment to articles in place, classifying them in one batched pass.
+
+    With ``fetch_bodies`` the full article text is downloaded first and used
+    instead of the Bing snippet.
+    """
+    if fetch_bodies:
+        attach_article_bodies(articles)
+    texts = [article_text(a) for a in articles]
+    sentiments = analyze_sentiment_batch(texts)
+    for article, topics, sentiment in zip(articles, detect_topics_batch(texts), sentiments):
+        article["topics"] = topics
+        article["sentiment"] = sentiment
+    return articles
+
+ENRICHED_FIELDS = ("topics", "sentiment", "body")
+
+def enrich_unique_articles(articles, fetch_bodies=False, dedup_index=None):
+    """Enrich articles, reusing results from near-duplicates already in ``dedup_index``.
+
+    Only articles with no enriched near-duplicate in the index are sent to the
+    model; they are then added to the index so later terms can reuse them.
+    """
+    if dedup_index is None:
+        return enrich_articles(articles, fetch_bodies=fetch_bodies)
+    signatures = [article_signature(a) for a in articles]
+    fresh = []
+    for article, (signature, threshold) in zip(articles, signatures):
+        original = dedup_index.find(signature, threshold)
+        if original is None:
+            fresh.append((article, signature, threshold))
+            continue
+        for field in ENRICHED_FIELDS:
+            if field in original:
+                article[field] = original[field]
+        article["duplicate_of"] = original["link"]
+    enrich_articles([article for article, _, _ in fresh], fetch_bodies=fetch_bodies)
+    for article, signature, threshold in fresh:
+        dedup_index.add(signature, article, threshold)
+    if len(fresh) < len(articles):
+        logging.info(f"♻️ Reused enrichment for {len(articles) - len(fresh)} near-duplicate articles")
+    return articles
+
+def iter_news(company_name, limit=None, batch_size=SENTIMENT_BATCH_SIZE, max_pages=MAX_NEWS_PAGES, fetch_bodies=False, dedup_index=None):
+    """Yield enriched articles page by page, going past the first page of Bing results.
+
+    Each page is enriched in chunks of ``batch_size``, so the first articles are
+    yielded before the rest of the page has been classified. Near-duplicate
+    stories (syndicated copies) are collapsed into the first copy, which lists
+    the others under 'duplicates'. Pass a shared ``dedup_index`` to also reuse
+    enrichment across several terms.
+    """
+    seen_links = set()
+    seen_stories = NearDuplicateIndex()
+    count = 0
+    offset = 0
+    for page in range(max_pages):
+        if limit is not None and count >= limit:
+            return
+        try:
+            news_cards = parse_news_cards(fetch_search_page(company_name, offset=offset), backend=NEWS_PARSER_BACKEND)
+        except Exception as e:
+            logging.error(f"❌ Fetching page {page + 1} for '{company_name}' failed: {e}")
+            return
+        logging.info(f"📰 Found {len(news_cards)} news elements on page {page + 1}")
+        offset += len(news_cards)
+
+        pending = []
         for card in news_cards:
-            title_tag = card.select_one("a.title") or card.select_one("h2 > a") or card.find("a")
-            if not title_tag or not title_tag.text.strip():
+            if not card["title"]:
                 logging.warning("⚠️ Skipping card with no title")
                 continue
-
-            title = title_tag.text.strip()
-            link = title_tag.get("href", "#")
-            summary_tag = card.find("div", class_="snippet") or card.find("div", class_="news-card-snippet") or card.find("p")
-            summary = summary_tag.text.strip() if summary_tag and summary_tag.text else "No summary available"
-            logging.info(f"✅ Article found: {title}")
-
-            sentiment = analyze_sentiment(summary)
-            topics = detect_topics(summary)
-            articles.append({"title": title, "summary": summary, "link": link, "topics": topics, "sentiment": sentiment})
-            if len(articles) == 10:
-                break
-
+            if card["link"] != "#" and card["link"] in seen_links:
+                continue
+            seen_links.add(card["link"])
+            article = {"title": card["title"], "summary": card["summary"], "link": card["link"]}
+            signature, threshold = article_signature(article)
+            original = seen_stories.find(signature, threshold)
+            if original is not None:
+                logging.info(f"🔁 Near-duplicate of '{original['title']}': {card['title']}")
+                original.setdefault("duplicates", []).append(card["link"])
+                continue
+            seen_stories.add(signature, article, threshold)
+            logging.info(f"✅ Article found: {card['title']}")
+            pending.append(article)
+        if limit is not None:
+            pending = pending[:limit - count]
+        # An empty page, or one that only repeats earlier results, means Bing has run out
+        if not pending:
+            return
+
+        for start in range(0, len(pending), batch_size):
+            for article in enrich_unique_articles(pending[start:start + batch_size], fetch_bodies=fetch_bodies, dedup_index=dedup_index):
+                count += 1
+                yield article
+
+def scrape_news(company_name, fetch_bodies=False, dedup_index=None):
+    try:
+        logging.info(f"🔍 Fetching news for: {company_name}")
+        articles = list(iter_news(company_name, limit=10, max_pages=1, fetch_bodies=fetch_bodies, dedup_index=dedup_index))
         if not articles:
             logging.warning(f"❌ No valid news articles found for '{company_name}'")
         return articles
@@ -64,53 +282,225 @@ def scrape_news(company_name):
         logging.error(f"❌ Scraping failed: {e}")
         return []
 
-def detect_topics(summary):
-    summary_lower = summary.lower()
-    topic_keywords = {
-        "AI": ["ai", "artificial intelligence", "machine learning", "gemini"],
-        "Mobile": ["mobile", "android", "phone", "app"],
-        "Partnerships": ["partner", "collaboration", "tie-up", "spacex", "mediatek"],
-        "Technology": ["tech", "innovation", "software", "hardware"],
-        "Security": ["security", "privacy", "delete", "dangerous"]
-    }
-    topics = [topic for topic, keywords in topic_keywords.items() if any(keyword in summary_lower for keyword in keywords)]
-    return topics or ["General"]
+def scrape_news_as_completed(terms, max_concurrency=SCRAPE_CONCURRENCY, dedup_index=None):
+    """Scrape several terms concurrently, yielding (term, articles) as each one finishes.
 
-def analyze_sentiment(text):
+    Pass a NearDuplicateIndex as ``dedup_index`` so a story already enriched for one
+    term is not classified again for another.
+    """
+    terms = list(dict.fromkeys(terms))
+    if not terms:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(terms)))) as pool:
+        futures = {pool.submit(scrape_news, term, dedup_index=dedup_index): term for term in terms}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def scrape_news_many(terms, max_concurrency=SCRAPE_CONCURRENCY, dedup_index=None):
+    """Scrape several terms concurrently and return a {term: articles} dict."""
+    return dict(scrape_news_as_completed(terms, max_concurrency=max_concurrency, dedup_index=dedup_index))
+
+def detect_topics(summary):
+    return get_topic_matcher().match(summary)
+
+def detect_topics_batch(texts):
+    """Detect topics for many texts with the taxonomy compiled once per process."""
+    return get_topic_matcher().match_batch(texts)
+
+def classify_remote(texts):
+    """Classify through the shared inference server.
+
+    Returns (labels, model, backend), or None when the server is not reachable.
+    """
+    global _inference_client, _sentiment_server_retry_at
+    if not SENTIMENT_SERVER or time.monotonic() < _sentiment_server_retry_at:
+        return None
+    if _inference_client is None:
+        _inference_client = InferenceClient(SENTIMENT_SERVER)
     try:
-        result = sentiment_pipeline(text)[0]
-        return result['label']
+        return _inference_client.classify(texts)
     except Exception as e:
-        logging.error(f"❌ Sentiment analysis failed: {e}")
-        return "N/A"
+        # Don't pay a connection attempt on every call while the server is down
+        _sentiment_server_retry_at = time.monotonic() + SENTIMENT_SERVER_RETRY
+        logging.info(f"Sentiment server unavailable ({e}), using the in-process model")
+        return None
 
-def text_to_speech(text, language='hi'):
+def sentiment_cache_key(text, model=SENTIMENT_MODEL, backend=SENTIMENT_BACKEND):
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{model}:{backend}\0{normalized}".encode("utf-8")).hexdigest()
+
+def analyze_sentiment(text):
+    return analyze_sentiment_batch([text])[0]
+
+def analyze_sentiment_batch(texts, batch_size=SENTIMENT_BATCH_SIZE):
+    """Classify many texts at once, returning labels in input order.
+
+    Labels are looked up in the shared sentiment cache first; only texts never
+    seen before (by any process) reach the model.
+    """
+    labels = ["N/A"] * len(texts)
+    if not texts:
+        return labels
+    keys = [sentiment_cache_key(text) for text in texts]
+    cached = sentiment_cache.get_many(keys)
+
+    # One model input per distinct uncached text, even if it repeats within the batch
+    pending = {}
+    for i, key in enumerate(keys):
+        if key in cached:
+            labels[i] = cached[key]
+        else:
+            pending.setdefault(key, texts[i])
+    if not pending:
+        return labels
+
+    # Sort by length so each batch holds similarly sized texts and padding stays small
+    order = sorted(pending, key=lambda key: len(pending[key]))
+    computed = {}
+    cacheable = True
+    remote = classify_remote([pending[key] for key in order])
+    if remote is not None:
+        remote_labels, model, backend = remote
+        computed = {key: label for key, label in zip(order, remote_labels) if label}
+        # Keys name this process's model; labels from a server running another one are used but not cached
+        cacheable = (model, backend) == (SENTIMENT_MODEL, SENTIMENT_BACKEND)
+        if not cacheable:
+            logging.info(f"Sentiment server runs {model} ({backend}); not caching its labels")
+    else:
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            try:
+                classifier = get_sentiment_pipeline()
+                with _sentiment_inference_lock:
+                    results = classifier([pending[key] for key in bucket], batch_size=len(bucket), truncation=True)
+                for key, result in zip(bucket, results):
+                    computed[key] = result['label']
+            except Exception as e:
+                logging.error(f"❌ Sentiment analysis failed: {e}")
+    if cacheable:
+        sentiment_cache.set_many(computed)
+    for i, key in enumerate(keys):
+        if key in computed:
+            labels[i] = computed[key]
+    return labels
+
+def audio_cache_key(translated_text, language, engine):
+    # The engine is part of the key, so switching engines never serves stale audio
+    return hashlib.sha256(f"{engine}\0{language}\0{translated_text}".encode("utf-8")).hexdigest()
+
+def _synthesize(translated_text, language, engines=None):
+    """Return (cached path, audio bytes) for already-translated text; bytes are None on a cache hit."""
+    engines = engines or engine_chain(language)
+    if not engines:
+        raise RuntimeError(f"No TTS engine available for language '{language}'")
+    cached = audio_cache.get_any(
+        (audio_cache_key(translated_text, language, engine.name), engine.suffix) for engine in engines
+    )
+    if cached:
+        logging.info("⚡ Audio cache hit")
+        return cached, None
+    for engine in engines:
+        try:
+            audio = engine.synthesize(translated_text, language)
+        except Exception as e:
+            logging.warning(f"⚠️ {engine.name} TTS failed, trying the next engine: {e}")
+            continue
+        # The only disk write: persisting the clip in the audio cache
+        key = audio_cache_key(translated_text, language, engine.name)
+        return audio_cache.put_bytes(key, audio, engine.suffix), audio
+    raise RuntimeError(f"All TTS engines failed for language '{language}'")
+
+def synthesize_speech(translated_text, language, engines=None):
+    """Return the path of an audio file for already-translated text, synthesizing it only on a cache miss.
+
+    Engines from ``engine_chain(language)`` are tried in order until one succeeds.
+    The returned file belongs to the audio cache: copy it to keep it, never move or delete it.
+    """
+    return _synthesize(translated_text, language, engines)[0]
+
+def speech_bytes(translated_text, language, engines=None):
+    """Like ``synthesize_speech`` but return (audio bytes, suffix); fresh audio is never re-read from disk."""
+    path, audio = _synthesize(translated_text, language, engines)
+    if audio is None:
+        with open(path, "rb") as f:
+            audio = f.read()
+    return audio, os.path.splitext(path)[1]
+
+def speech_chunks(sentences, max_chars=TTS_CHUNK_CHARS):
+    """Group sentences into chunks of about ``max_chars`` without splitting a sentence."""
+    chunks, current = [], ""
+    for sentence in sentences:
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+def iter_speech_chunks(sentences, language, max_workers=TTS_WORKERS, engines=None):
+    """Synthesize chunks concurrently, yielding (audio bytes, suffix) in playback order as soon as each is ready."""
+    chunks = speech_chunks(sentences)
+    if not chunks:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+        futures = [pool.submit(speech_bytes, chunk, language, engines) for chunk in chunks]
+        for future in futures:
+            yield future.result()
+
+def _speak(text, language, chunked, on_first_chunk):
+    """Return (cached path, audio bytes or None, translated text)."""
+    if not chunked:
+        translated = translate_text(text, language)
+        return _synthesize(translated, language) + (translated,)
+
+    sentences = translate_sentences(split_sentences(text, min_chars=1), language)
+    translated = " ".join(sentences)
+    engines = engine_chain(language)
+    key = audio_cache_key(translated, language, "+".join(engine.name for engine in engines) + "-chunked")
+    cached = audio_cache.get_any((key, suffix) for suffix in dict.fromkeys(engine.suffix for engine in engines))
+    if cached:
+        return cached, None, translated
+    parts, suffixes = [], set()
+    for index, (audio, suffix) in enumerate(iter_speech_chunks(sentences, language, engines=engines)):
+        if index == 0 and on_first_chunk:
+            on_first_chunk(audio, MIME_TYPES[suffix])
+        suffixes.add(suffix)
+        parts.append(audio)
+    if len(suffixes) != 1:
+        # A fallback engine spoke some chunks in another format; speak the text in one piece instead
+        return _synthesize(translated, language, engines) + (translated,)
+    suffix = suffixes.pop()
+    audio = concat_audio(parts, suffix)
+    return audio_cache.put_bytes(key, audio, suffix), audio, translated
+
+def text_to_speech(text, language='hi', chunked=False, on_first_chunk=None):
+    """Translate and speak text, returning (audio path, translated text).
+
+    With ``chunked`` the text is split on sentence boundaries and the chunks are
+    synthesized in parallel; ``on_first_chunk(audio_bytes, mime_type)`` is called
+    as soon as the opening chunk can be played, before the full clip is assembled.
+    The path belongs to the audio cache: copy it to keep it.
+    """
     try:
-        translator = Translator()
-        translated = translator.translate(text, dest=language).text if language != 'en' else text
-        audio_path = tempfile.mktemp(suffix=".mp3")
-        gTTS(text=translated, lang=language).save(audio_path)
-        return audio_path, translated
+        path, _, translated = _speak(text, language, chunked, on_first_chunk)
+        return path, translated
     except Exception as e:
         logging.error(f"❌ TTS failed: {e}")
         return "", ""
 
-def escape_ffmpeg_text(text):
-    if not isinstance(text, str):
-        raise TypeError("Input must be a string")
-    if not text:
-        return ""
-    escape_chars = {
-        '\\': '\\\\', ':': '\\:', "'": "\\'", ',': '\\,', '%': '\\%', '\n': ' ',
-        '"': '\\"', '=': '\\=', '[': '\\[', ']': '\\]', '{': '\\{', '}': '\\}',
-        '$': '\\$', '#': '\\#', '@': '\\@', '&': '\\&'
-    }
-    result = text
-    for char, escaped in escape_chars.items():
-        result = result.replace(char, escaped)
-    if len(result) > 200:
-        result = result[:200].rsplit(' ', 1)[0] + '...'
-    return result.strip()
+def text_to_speech_audio(text, language='hi', chunked=False, on_first_chunk=None):
+    """Like ``text_to_speech`` but return (audio bytes, mime type, translated text) for in-memory playback."""
+    try:
+        path, audio, translated = _speak(text, language, chunked, on_first_chunk)
+        if audio is None:
+            with open(path, "rb") as f:
+                audio = f.read()
+        return audio, MIME_TYPES[os.path.splitext(path)[1]], translated
+    except Exception as e:
+        logging.error(f"❌ TTS failed: {e}")
+        return b"", "", ""
 
 def get_default_font_path():
     system = platform.system()
@@ -121,115 +511,240 @@ def get_default_font_path():
     else:
         return "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf"
 
-def generate_news_reel(text, language="hi", output_file="news_reel.mp4", font_size=30, bg_color="black", image_path=None):
-    audio_path = None
-    video_no_audio_path = None
-    try:
-        if not text or not isinstance(text, str):
-            raise ValueError("Input text must be a non-empty string")
-
-        translator = Translator()
-        translated_text = translator.translate(text, dest=language).text if language != "en" else text
-
-        # Generate audio
-        audio_path = tempfile.mktemp(suffix=".mp3")
-        gTTS(text=translated_text, lang=language).save(audio_path)
-
-        # Get audio duration
-        probe = ffmpeg.probe(audio_path)
-        audio_duration = float(probe['format']['duration'])
-        if audio_duration < 2:
-            audio_duration = 5.0
-
-        # Wrap subtitle text
-        wrapped_lines = textwrap.wrap(translated_text, width=40)
-        duration_per_line = audio_duration / max(len(wrapped_lines), 1)
-
-        # Use multilingual font
-        font_path = get_default_font_path()
-        if not os.path.exists(font_path):
-            raise FileNotFoundError(f"Font not found: {font_path}")
-
-        drawtext_filters = []
-        for idx, line in enumerate(wrapped_lines):
-            safe_line = escape_ffmpeg_text(line)
-            if not safe_line:
-                continue
-            start = idx * duration_per_line
-            end = start + duration_per_line
-            drawtext_filters.append(
-                f"drawtext=fontfile='{font_path}':text='{safe_line}':fontcolor=white:fontsize={font_size}:x=(w-text_w)/2:y=h-100:enable='between(t,{start:.2f},{end:.2f})'"
-            )
-        full_filter = ",".join(drawtext_filters)
-        video_no_audio_path = tempfile.mktemp(suffix=".mp4")
-
-        # --- Add background image or animation if provided ---
-        if image_path and os.path.exists(image_path):
-            # Use the image as a background, loop it for the duration
-            (
-                ffmpeg
-                .input(image_path, loop=1, t=audio_duration)
-                .output(video_no_audio_path, vf=full_filter, vcodec="libx264", pix_fmt="yuv420p", r=30)
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
-        else:
-            # Use a color background with a simple fade animation
-            (
-                ffmpeg
-                .input(f"color={bg_color}:s=720x1280:r=30", f="lavfi", t=audio_duration)
-                .output(video_no_audio_path, vf=f"fade=in:0:30,{full_filter}", vcodec="libx264", pix_fmt="yuv420p")
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
-
-        # Combine with audio
-        (
+def get_default_font_name():
+    """Family name of the font at get_default_font_path(), as subtitle styles refer to it."""
+    return "Noto Sans" if platform.system() not in ("Darwin", "Windows") else "Arial"
+
+def run_ffmpeg(stream, duration, on_progress=None, should_cancel=None):
+    """Run an ffmpeg-python stream, reporting the encoded fraction of ``duration`` as it goes.
+
+    ffmpeg writes ``-progress`` key=value lines to stdout; ``on_progress`` gets a
+    float in [0, 1]. When ``should_cancel()`` turns true, ffmpeg is killed and
+    RuntimeError is raised.
+    """
+    import ffmpeg
+
+    process = stream.global_args("-progress", "pipe:1", "-nostats").run_async(pipe_stdout=True, pipe_stderr=True)
+    stderr = []
+    # Drain stderr in the background so a chatty ffmpeg never blocks on a full pipe
+    drain = threading.Thread(target=lambda: stderr.append(process.stderr.read()), daemon=True)
+    drain.start()
+    stdout = []
+    for line in process.stdout:
+        stdout.append(line)
+        if should_cancel and should_cancel():
+            process.kill()
+            process.wait()
+            raise RuntimeError("Render cancelled")
+        key, _, value = line.decode(errors="ignore").strip().partition("=")
+        if on_progress and key in ("out_time_us", "out_time_ms") and value.isdigit() and duration:
+            # Both keys are in microseconds (out_time_ms is misnamed by ffmpeg)
+            on_progress(min(int(value) / (duration * 1_000_000), 1.0))
+    process.wait()
+    drain.join()
+    if process.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", b"".join(stdout), b"".join(stderr))
+    if on_progress:
+        on_progress(1.0)
+
+# x264 settings per render profile; "threads": 0 lets x264 pick, and a caller's explicit thread count wins
+RENDER_PROFILES = {
+    "draft": {"width": 480, "height": 854, "fps": 24, "preset": "ultrafast", "crf": 30, "threads": 1},
+    "fast": {"width": 720, "height": 1280, "fps": 30, "preset": "veryfast", "crf": 26, "threads": 0},
+    "quality": {"width": 1080, "height": 1920, "fps": 30, "preset": "medium", "crf": 20, "threads": 0},
+}
+DEFAULT_RENDER_PROFILE = os.environ.get("REEL_PROFILE", "fast")
+
+def render_reel(translated_text, audio_path, output_file, font_size=30, bg_color="black", image_path=None,
+                profile=DEFAULT_RENDER_PROFILE, threads=None, font_path=None, font_name=None,
+                on_progress=None, should_cancel=None):
+    """Encode a reel from text that is already translated and its narration; raises on failure."""
+    import ffmpeg
+
+    settings = RENDER_PROFILES[profile]
+    width, height, fps = settings["width"], settings["height"], settings["fps"]
+
+    # Read the duration from the audio headers instead of spawning ffprobe
+    audio_duration = audio_duration_of(audio_path)
+    if audio_duration < 2:
+        audio_duration = 5.0
+
+    # Use multilingual font
+    font_path = font_path or get_default_font_path()
+    if not os.path.exists(font_path):
+        raise FileNotFoundError(f"Font not found: {font_path}")
+
+    # --- Background image if provided, otherwise a color background with a fade-in ---
+    # A color comes as a pre-encoded clip that is only trimmed; an image as a scaled still that is looped
+    video = background_input(bg_color, image_path, width, height, fps, audio_duration)
+    audio = ffmpeg.input(audio_path)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # One timed subtitle track burned in by a single filter, however long the text is.
+        # It is laid out at 720x1280 and libass scales it to the profile's resolution.
+        subtitle_path = os.path.join(work_dir, "subtitles.ass")
+        with open(subtitle_path, "w", encoding="utf-8") as f:
+            f.write(build_ass(translated_text, audio_duration, font_name or get_default_font_name(), font_size))
+
+        # One ffmpeg run renders the background, subtitles and audio straight into the output file
+        stream = (
             ffmpeg
-            .output(ffmpeg.input(video_no_audio_path), ffmpeg.input(audio_path), output_file,
-                    vcodec='copy', acodec='aac', shortest=None)
+            .output(video.video, audio.audio, output_file,
+                    vf=subtitles_filter(subtitle_path, fonts_dir=os.path.dirname(font_path)), vcodec="libx264",
+                    preset=settings["preset"], crf=settings["crf"], threads=threads or settings["threads"],
+                    pix_fmt="yuv420p", r=fps, acodec="aac", shortest=None)
             .overwrite_output()
-            .run(capture_stdout=True, capture_stderr=True)
         )
+        run_ffmpeg(stream, audio_duration, on_progress=on_progress, should_cancel=should_cancel)
+    return output_file
+
+def reel_cache_key(translated_text, language, font_size=30, bg_color="black", image_path=None, profile=DEFAULT_RENDER_PROFILE):
+    """Cache key covering everything that changes a reel's pixels or sound."""
+    background = file_digest(image_path) if image_path and os.path.exists(image_path) else f"color:{bg_color}"
+    # The configured engine order names the voice without starting any engine just to build a key
+    voice = "+".join(engine_names(language))
+    font = f"{get_default_font_path()}:{get_default_font_name()}:{font_size}"
+    parts = [translated_text, language, voice, background, font, profile, repr(sorted(RENDER_PROFILES[profile].items()))]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+def find_cached_reel(text, language="hi", font_size=30, bg_color="black", image_path=None, profile=DEFAULT_RENDER_PROFILE, **_):
+    """Path of an already rendered reel for these generate_news_reel arguments, or None."""
+    try:
+        key = reel_cache_key(translate_text(text, language), language, font_size, bg_color, image_path, profile)
+        return reel_cache.get(key, ".mp4")
+    except Exception as e:
+        logging.error(f"❌ Reel cache lookup failed: {e}")
+        return None
 
-        # Cleanup
-        for f in [audio_path, video_no_audio_path]:
-            if f and os.path.exists(f):
-                os.remove(f)
+def generate_news_reel(text, language="hi", output_file=None, font_size=30, bg_color="black", image_path=None,
+                       profile=DEFAULT_RENDER_PROFILE, threads=None, on_progress=None, should_cancel=None):
+    """Render (or reuse) a reel and return its path, or "" on failure.
 
-        logging.info(f"✅ News reel created: {output_file}")
-        return output_file
+    Reels live in the content-addressed reel cache, so identical requests are
+    served without re-encoding and concurrent sessions never share a file
+    being written. Pass ``output_file`` to also get a private copy there.
+    """
+    try:
+        if not text or not isinstance(text, str):
+            raise ValueError("Input text must be a non-empty string")
+
+        translated_text = translate_text(text, language)
+        key = reel_cache_key(translated_text, language, font_size, bg_color, image_path, profile)
+        reel_path = reel_cache.get(key, ".mp4")
+        if reel_path:
+            logging.info("⚡ Reel cache hit")
+        else:
+            # Generate audio (shared with text_to_speech through the audio cache)
+            audio_path = synthesize_speech(translated_text, language)
+
+            tmp_path = reel_cache.temp_path(".mp4")
+            try:
+                render_reel(
+                    translated_text, audio_path, tmp_path, font_size=font_size, bg_color=bg_color,
+                    image_path=image_path, profile=profile, threads=threads,
+                    on_progress=on_progress, should_cancel=should_cancel,
+                )
+                reel_path = reel_cache.put_file(key, tmp_path, ".mp4")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        if output_file:
+            shutil.copyfile(reel_path, output_file)
+            reel_path = output_file
+        logging.info(f"✅ News reel created: {reel_path}")
+        return reel_path
 
-    except Exception as e:
-        logging.error("❌ FFmpeg error while generating video:")
-        logging.error(f"STDOUT:\n{e.stdout.decode(errors='ignore') if hasattr(e, 'stdout') and e.stdout else '(no stdout)'}")
-        logging.error(f"STDERR:\n{e.stderr.decode(errors='ignore') if hasattr(e, 'stderr') and e.stderr else '(no stderr)'}")
-        return ""
     except Exception as e:
         logging.error(f"❌ News reel generation failed: {str(e)}")
+        stderr = getattr(e, "stderr", None)
+        if stderr:
+            logging.error(f"FFmpeg STDERR:\n{stderr.decode(errors='ignore')}")
         return ""
 
 
+SUMMARY_MAX_CHARS = 600  # Default length of generate_article_summary output (~40 s of speech)
+
+CLUSTER_SIMILARITY = 0.25  # Cosine similarity at which two articles cover the same angle
+OUTLIER_SIMILARITY = 0.08  # Articles below this similarity to every other article are outliers
+MAX_COVERAGE_COMPARISONS = 3  # Cluster pairs described under "Coverage Differences"
+
+def sentiment_bucket(sentiment):
+    return 'Positive' if sentiment == 'POSITIVE' else 'Negative' if sentiment == 'NEGATIVE' else 'Neutral'
+
+def describe_coverage_difference(a, b, similarity):
+    """One "Coverage Differences" entry contrasting two (representative) articles."""
+    topics_a, topics_b = set(a['topics']), set(b['topics'])
+    notes = []
+    if topics_a - topics_b:
+        notes.append(f"the first focuses on {', '.join(sorted(topics_a - topics_b))}")
+    if topics_b - topics_a:
+        notes.append(f"the second focuses on {', '.join(sorted(topics_b - topics_a))}")
+    if a['sentiment'] != b['sentiment']:
+        notes.append(f"tone differs ({sentiment_bucket(a['sentiment']).lower()} vs {sentiment_bucket(b['sentiment']).lower()})")
+    if not notes:
+        shared = ', '.join(sorted(topics_a & topics_b)) or "the same subject"
+        notes.append(f"both cover {shared} with different details")
+    impact = "; ".join(notes)
+    return {
+        "Comparison": f"{a['title']} vs {b['title']}",
+        "Similarity": round(float(similarity), 2),
+        "Impact": impact[0].upper() + impact[1:] + ".",
+    }
+
 def comparative_analysis(articles):
+    import numpy as np
+
     sentiment_distribution = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
     for article in articles:
-        sentiment = article['sentiment']
-        sentiment_distribution['Positive' if sentiment == 'POSITIVE' else 'Negative' if sentiment == 'NEGATIVE' else 'Neutral'] += 1
-
-    coverage_differences = [
-        {"Comparison": f"{articles[i]['title']} vs {articles[i+1]['title']}", "Impact": "Varies by content"}
-        for i in range(min(len(articles)-1, 1))
-    ] if len(articles) > 1 else []
+        sentiment_distribution[sentiment_bucket(article['sentiment'])] += 1
 
+    topic_counts = Counter(t for a in articles for t in set(a['topics']))
     topic_overlap = {
-        "Common Topics": ["Technology"],
-        "Unique Topics": list(set([t for a in articles for t in a['topics']]))
+        "Common Topics": [t for t, count in topic_counts.most_common() if count > 1],
+        "Unique Topics": sorted(t for t, count in topic_counts.items() if count == 1)
     }
 
+    coverage_differences, clusters, outliers = [], [], []
+    if len(articles) > 1:
+        similarity = similarity_matrix([f"{a['title']} {article_text(a)}" for a in articles])
+        labels = connected_clusters(similarity >= CLUSTER_SIMILARITY)
+
+        # Representative = member with the highest mean similarity to the rest of its cluster
+        representatives = []
+        for label in sorted(set(labels.tolist()), key=lambda l: -int((labels == l).sum())):
+            members = np.flatnonzero(labels == label)
+            centrality = similarity[np.ix_(members, members)].mean(axis=1)
+            representative = int(members[centrality.argmax()])
+            representatives.append(representative)
+            member_sentiments = Counter(sentiment_bucket(articles[m]['sentiment']) for m in members)
+            clusters.append({
+                "Articles": [articles[m]['title'] for m in members],
+                "Representative": articles[representative]['title'],
+                "Topics": sorted({t for m in members for t in articles[m]['topics']}),
+                "Dominant Sentiment": member_sentiments.most_common(1)[0][0],
+            })
+
+        # Pairs among the largest clusters; three clusters already give three comparisons
+        top = representatives[:MAX_COVERAGE_COMPARISONS]
+        pairs = [(a, b) for i, a in enumerate(top) for b in top[i + 1:]]
+        if not pairs:
+            # Everything falls in one cluster: contrast its two least similar articles
+            masked = similarity + np.eye(len(articles)) * 2
+            pairs = [tuple(int(i) for i in np.unravel_index(masked.argmin(), masked.shape))]
+        for a, b in pairs[:MAX_COVERAGE_COMPARISONS]:
+            coverage_differences.append(describe_coverage_difference(articles[a], articles[b], similarity[a, b]))
+
+        if len(articles) > 2:
+            closest = np.where(np.eye(len(articles), dtype=bool), -1.0, similarity).max(axis=1)
+            outliers = [articles[i]['title'] for i in np.flatnonzero(closest < OUTLIER_SIMILARITY)]
+
     return {
         "Sentiment Distribution": sentiment_distribution,
         "Coverage Differences": coverage_differences,
-        "Topic Overlap": topic_overlap
+        "Topic Overlap": topic_overlap,
+        "Coverage Clusters": clusters,
+        "Outlier Articles": outliers
     }
 
 def generate_final_output(company_name, articles, comparative_analysis_result):
@@ -251,10 +766,23 @@ def generate_final_output(company_name, articles, comparative_analysis_result):
         "Audio": "[Play Hindi Speech]"
     }
 
-def generate_article_summary(articles):
-    """Generate a concise summary of multiple articles."""
-    # Fallback to basic summary only, no Groq LLM
-    return " ".join([a['summary'] for a in articles[:3]])
+def generate_article_summary(articles, max_chars=SUMMARY_MAX_CHARS, max_seconds=None):
+    """Generate a concise summary of multiple articles.
+
+    Extractive: the most central non-redundant sentences across the articles
+    (bodies when fetched, snippets otherwise) within a character or speech-time
+    budget, so TTS and reels stay short.
+    """
+    texts = [article_text(a) for a in articles if a.get('summary') != NO_SUMMARY or a.get('body')]
+    try:
+        summary = summarize_extractive(texts, max_chars=max_chars, max_seconds=max_seconds)
+    except Exception as e:
+        logging.error(f"❌ Extractive summary failed: {e}")
+        summary = ""
+    # Fall back to the leading snippets if no sentence could be extracted
+    return summary or " ".join([a['summary'] for a in articles[:3]])[:max_chars]
+
+record_timing("utils_import", _IMPORT_STARTED)
 
 if __name__ == "__main__":
     company = "Google"